@@ -82,7 +82,8 @@ def scan_device(scan_internal: bool = True, scan_sdcard: bool = False) -> Option
             result = scan_media_folders(
                 scan_internal=scan_internal,
                 scan_sdcard=scan_sdcard,
-                progress_callback=on_progress
+                progress_callback=on_progress,
+                fast_path=not scan_sdcard
             )
             return result
         except ADBError as e:
@@ -182,12 +183,9 @@ def run_backup(folders: list[MediaFolder], destination: str):
     
     # Analyze first
     console.print("\n[bold]Analisi file...[/]")
-    to_sync, already_synced = manager.analyze_folders(folders)
+    to_sync, already_synced, new_size, sync_size = manager.analyze_folders(folders)
     
     # Show sync status
-    sync_size = sum(f.size for f in already_synced)
-    new_size = sum(f.size for f in to_sync)
-    
     status_panel = f"""[bold green]Gia sincronizzati:[/] {len(already_synced):,} file ({format_size(sync_size)})
 [bold yellow]Da scaricare:[/] {len(to_sync):,} file ({format_size(new_size)})"""
     
@@ -226,7 +224,10 @@ def run_backup(folders: list[MediaFolder], destination: str):
             )
         
         try:
-            result = manager.start_backup(folders, progress_callback=on_progress)
+            result = manager.backup_files(
+                to_sync, already_synced, new_size, sync_size,
+                progress_callback=on_progress
+            )
             
             # Show results
             console.print("\n")
@@ -3,11 +3,18 @@ ADB Wrapper Module
 Handles all communication with Android devices via ADB.
 """
 
+import codecs
 import os
+import posixpath
+import queue
 import subprocess
 import re
 import shlex
-from typing import Optional
+import threading
+import time
+from contextlib import closing
+from functools import lru_cache
+from typing import Iterator, Optional
 
 from .adb_models import Device, ADBError
 
@@ -155,6 +162,148 @@ def shell_command(command: str, device_serial: Optional[str] = None) -> str:
         raise ADBError(f"Command timed out: {command}")
 
 
+class PersistentShell:
+    """
+    A single long-lived `adb shell` session that runs commands in sequence.
+    
+    Each shell_command() call spawns a new adb process and opens a new
+    shell channel on the device; for many small commands that setup cost
+    dominates. Commands sent through run() reuse one channel instead. The
+    session is started lazily and restarted if it dies.
+    
+    Usage:
+        with PersistentShell(device_serial) as shell:
+            out = shell.run('ls /storage')
+    """
+    
+    _SENTINEL = '__ANDROSYNC_END__'
+    
+    def __init__(self, device_serial: Optional[str] = None):
+        self.device_serial = device_serial
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: Optional[queue.Queue] = None
+    
+    def __enter__(self) -> 'PersistentShell':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def _start(self) -> None:
+        cmd = ["adb"]
+        if self.device_serial:
+            cmd.extend(["-s", self.device_serial])
+        cmd.append("shell")
+        
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                bufsize=1
+            )
+        except OSError as e:
+            self._proc = None
+            raise ADBError(f"Cannot start adb shell: {e}")
+        
+        # Reading on a thread lets run() wait with a timeout, which a plain
+        # readline() on a pipe can't do (on every platform).
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read, args=(self._proc, self._lines), daemon=True).start()
+    
+    @staticmethod
+    def _read(proc: subprocess.Popen, lines: queue.Queue) -> None:
+        """Feed the session's output lines to the queue, then None at EOF."""
+        try:
+            for line in proc.stdout:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            proc.stdout.close()
+            lines.put(None)
+    
+    def run(self, command: str, check: bool = True, timeout: float = 300) -> str:
+        """
+        Run a command in the session and return its output.
+        
+        Args:
+            command: Shell command to execute (must not read stdin).
+            check: Raise ADBError if the command exits non-zero.
+            timeout: Seconds to wait for the command before killing the session.
+        
+        Returns:
+            Command output as string.
+        
+        Raises:
+            ADBError: If the session dies or times out, or (with check) the
+                command fails.
+        """
+        if self._proc is None or self._proc.poll() is not None:
+            self._start()
+        proc = self._proc
+        lines_queue = self._lines
+        
+        # The extra echo guarantees the sentinel starts on its own line even
+        # when the output has no trailing newline; it is stripped below.
+        try:
+            proc.stdin.write(f"{command}\n__rc=$?; echo; echo {self._SENTINEL}$__rc\n")
+            proc.stdin.flush()
+        except (OSError, ValueError):
+            self.close()
+            raise ADBError(f"adb shell session closed: {command}")
+        
+        deadline = time.monotonic() + timeout
+        lines = []
+        while True:
+            try:
+                line = lines_queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                # Still busy, so don't wait for it to exit on its own
+                proc.kill()
+                self.close()
+                raise ADBError(f"Command timed out: {command}")
+            if line is None:
+                self.close()
+                raise ADBError(f"adb shell session closed: {command}")
+            if line.startswith(self._SENTINEL):
+                break
+            lines.append(line)
+        
+        output = ''.join(lines)[:-1]
+        
+        try:
+            exit_code = int(line[len(self._SENTINEL):].strip())
+        except ValueError:
+            exit_code = 0
+        if check and exit_code != 0:
+            raise ADBError(f"Shell command failed ({exit_code}): {command}")
+        
+        return output
+    
+    def close(self) -> None:
+        """Terminate the session (safe to call more than once)."""
+        proc = self._proc
+        self._proc = None
+        self._lines = None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        # stdout is closed by the reader thread once it sees EOF
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
 def pull_file(remote_path: str, local_path: str, device_serial: Optional[str] = None) -> bool:
     """
     Pull a file from the Android device to local filesystem.
@@ -300,186 +449,321 @@ def pull_files_tar(
     return success, failed
 
 
-def list_files(path: str, device_serial: Optional[str] = None) -> list[dict]:
+def _parse_stat_line(line: str) -> Optional[dict]:
     """
-    List files in a directory on the Android device with details.
+    Parse one line of `stat -c "%s %Y %n"` output.
+    
+    Returns:
+        Dict with: path, name, size, mtime, is_dir; or None if malformed.
+    """
+    parts = line.rstrip('\r\n').split(' ', 2)
+    if len(parts) < 3 or not parts[2]:
+        return None
+    try:
+        size = int(parts[0])
+    except ValueError:
+        return None
+    path = parts[2]
+    return {
+        'path': path,
+        'name': posixpath.basename(path),
+        'size': size,
+        'mtime': parts[1],
+        'is_dir': False
+    }
+
+
+# Bytes read from a streaming adb pipe at a time
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _stream_shell_lines(command: str, device_serial: Optional[str] = None) -> Iterator[str]:
+    """
+    Run a shell command on the device and yield its output line by line
+    while it is still running.
     
     Args:
-        path: Directory path on the device.
+        command: Shell command to execute.
         device_serial: Optional device serial.
     
-    Returns:
-        List of dicts with keys: name, size, mtime, is_dir
+    Yields:
+        Non-empty output lines, stripped.
     """
-    # Use ls -la for detailed listing
-    output = shell_command(f'ls -la "{path}" 2>/dev/null', device_serial)
+    cmd = ["adb"]
+    if device_serial:
+        cmd.extend(["-s", device_serial])
+    cmd.extend(["shell", command])
     
-    files = []
-    for line in output.strip().split('\n'):
-        if not line or line.startswith('total'):
-            continue
-        
-        # Parse ls -la output
-        # Format: drwxrwx--- 2 root sdcard_rw 4096 2024-01-15 10:30 dirname
-        parts = line.split()
-        if len(parts) < 7:
-            continue
-        
-        permissions = parts[0]
-        is_dir = permissions.startswith('d')
-        
-        try:
-            size = int(parts[4])
-        except (ValueError, IndexError):
-            size = 0
-        
-        # Date and time are in parts[5] and parts[6]
-        try:
-            mtime = f"{parts[5]} {parts[6]}"
-        except IndexError:
-            mtime = ""
-        
-        # Name is everything after the time (handles spaces in names)
-        name_parts = parts[7:]
-        if not name_parts:
-            continue
-        name = ' '.join(name_parts)
-        
-        # Skip . and ..
-        if name in ['.', '..']:
-            continue
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+    except OSError:
+        return
+    
+    # Read raw bytes in large chunks and decode each chunk in one call
+    # rather than one readline + decode per path; the incremental decoder
+    # handles characters split across chunk boundaries.
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    try:
+        while True:
+            chunk = proc.stdout.read1(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (pending + decoder.decode(chunk)).split('\n')
+            pending = lines.pop()
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield line
         
-        files.append({
-            'name': name,
-            'size': size,
-            'mtime': mtime,
-            'is_dir': is_dir,
-            'path': f"{path.rstrip('/')}/{name}"
-        })
-    
-    return files
+        line = (pending + decoder.decode(b'', final=True)).strip()
+        if line:
+            yield line
+    finally:
+        # Also reached when the consumer stops early: don't leave adb running
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
 
 
-def get_file_stat(path: str, device_serial: Optional[str] = None) -> Optional[dict]:
+def _stat_batch(
+    paths: list[str],
+    device_serial: Optional[str] = None,
+    shell: Optional[PersistentShell] = None
+) -> list[dict]:
     """
-    Get file statistics for a single file.
+    Get size and mtime for a batch of remote files with a single stat call.
     
     Args:
-        path: File path on the device.
+        paths: Remote file paths (kept small enough to avoid arg-list-too-long).
         device_serial: Optional device serial.
+        shell: Optional persistent session to run stat in instead of a new adb call.
     
     Returns:
-        Dict with size and mtime, or None if file doesn't exist.
+        List of dicts with: path, name, size, mtime, is_dir
     """
+    quoted = ' '.join(f'"{p}"' for p in paths)
+    # stat -c "%s %Y %n" → "<size> <mtime_epoch> <path>"
+    stat_cmd = f'stat -c "%s %Y %n" {quoted} 2>/dev/null'
     try:
-        output = shell_command(f'stat -c "%s %Y" "{path}" 2>/dev/null', device_serial)
-        parts = output.strip().split()
-        if len(parts) >= 2:
-            return {
-                'size': int(parts[0]),
-                'mtime': int(parts[1])
-            }
-    except (ADBError, ValueError):
-        pass
-    return None
+        if shell is not None:
+            # A file vanishing mid-scan makes stat exit 1; keep the rest
+            stat_out = shell.run(stat_cmd, check=False)
+        else:
+            stat_out = shell_command(stat_cmd, device_serial)
+    except ADBError:
+        stat_out = ""
+    
+    files = []
+    if stat_out.strip():
+        for line in stat_out.strip().split('\n'):
+            info = _parse_stat_line(line)
+            if info is not None:
+                files.append(info)
+    else:
+        # stat not available or failed — include files with zero metadata
+        for path in paths:
+            name = posixpath.basename(path)
+            files.append({
+                'path': path,
+                'name': name,
+                'size': 0,
+                'mtime': '0',
+                'is_dir': False
+            })
+    
+    return files
 
 
-def find_media_files(
-    storage_root: str,
+@lru_cache(maxsize=None)
+def _find_exclude_clause(exclude_patterns: tuple[str, ...]) -> str:
+    """
+    Build the find -prune clauses for excluded directories (POSIX
+    compatible, no grouping). Cached: every scan uses the same few lists.
+    """
+    return ''.join(f' -path "*/{pattern}/*" -prune -o' for pattern in exclude_patterns)
+
+
+@lru_cache(maxsize=None)
+def _find_stat_expression(ext_list: Optional[tuple[str, ...]]) -> str:
+    """
+    Build the find expression that stats matching regular files.
+    
+    One `-type f -iname "*.ext" -exec stat ... {} +` branch per extension,
+    joined with -o (no \\( \\) grouping, which BusyBox find lacks), so
+    non-matching files are never stat'ed. No extensions means all files.
+    """
+    action = '-exec stat -c "%s %Y %n" {} +'
+    if not ext_list:
+        return f'-type f {action}'
+    return ' -o '.join(f'-type f -iname "*.{ext}" {action}' for ext in ext_list)
+
+
+# Device serials whose find is known not to handle the single-pass
+# -iname/-exec {} + expression (the fallback found files it missed), so
+# later scans go straight to the fallback. Only failures are remembered:
+# an empty single pass always falls back, since the serial may now be a
+# different device (see clear_find_support_cache).
+_find_exec_unsupported: set[Optional[str]] = set()
+
+
+def clear_find_support_cache() -> None:
+    """Forget which devices lack single-pass find support, e.g. on device refresh."""
+    _find_exec_unsupported.clear()
+
+
+# Printed before each root's output in iter_media_files_multi(); can't be
+# mistaken for a stat line (starts with the size) or a path (starts with /)
+_ROOT_MARKER = '__ANDROSYNC_ROOT__ '
+
+
+def iter_media_files_multi(
+    storage_roots: list[str],
     extensions: set[str],
     device_serial: Optional[str] = None,
     exclude_patterns: Optional[list[str]] = None
-) -> list[dict]:
+) -> Iterator[tuple[str, dict]]:
     """
-    Find all media files in a storage root.
-    Uses POSIX-compatible find -print | grep (works on all Android/BusyBox versions).
+    Stream all media files under several storage roots with one adb call.
+    Uses POSIX-compatible find | grep (works on all Android/BusyBox versions).
     Avoids find \\( \\) grouping and -printf which are GNU-only and fail on BusyBox.
     
+    The roots are searched one after another by a single device-side
+    script, each preceded by a marker line, so every record is attributed
+    to the root it was found under (even when roots are nested) and all
+    records of a root arrive together.
+    
+    Normally find filters by extension (-iname) and stats the matches
+    itself via `-exec stat ... {} +`, so paths, sizes and mtimes arrive in
+    one stream. If that yields nothing (e.g. a find without -iname or
+    `-exec {} +`), it falls back to listing paths with -print, filtering
+    them with grep and stat'ing them in batches.
+    
     Args:
-        storage_root: Root path to search (e.g., /storage/emulated/0)
+        storage_roots: Root paths to search (e.g., ['/storage/emulated/0'])
         extensions: Set of file extensions to find (e.g., {'.jpg', '.mp4'})
         device_serial: Optional device serial
         exclude_patterns: Optional list of path patterns to exclude
     
-    Returns:
-        List of dicts with: path, name, size, mtime
+    Yields:
+        Tuples of (storage_root, dict with: path, name, size, mtime)
     """
-    # Build exclude clauses for find -prune (POSIX compatible, no grouping)
-    exclude_cmd = ""
-    if exclude_patterns:
-        for pattern in exclude_patterns:
-            exclude_cmd += f' -path "*/{pattern}/*" -prune -o'
-
-    # POSIX find: list all regular files, then filter by extension via grep.
-    # Avoids \( \) grouping and -printf which are GNU-only and fail on BusyBox.
-    find_cmd = (
-        f'find "{storage_root}"'
-        f'{exclude_cmd} '
-        f'-type f -print 2>/dev/null'
-    )
-
-    # Add grep extension filter if needed (grep -iE is available on all BusyBox)
+    exclude_cmd = _find_exclude_clause(tuple(exclude_patterns or ()))
+
+    ext_list = None
     if extensions and '*' not in extensions:
-        ext_list = sorted(e.lstrip('.') for e in extensions)
+        ext_list = tuple(sorted(e.lstrip('.') for e in extensions))
+    
+    def _script(find_expr: str, filter_cmd: str = '') -> str:
+        return '; '.join(
+            f'echo "{_ROOT_MARKER}{root}"; '
+            f'find "{root}"{exclude_cmd} {find_expr} 2>/dev/null{filter_cmd}'
+            for root in storage_roots
+        )
+    
+    # Single pass: find matches the extensions itself and hands only the
+    # matching files to stat, in argument-list-sized batches. Skipped on
+    # devices where it is already known not to work.
+    root = None
+    if device_serial not in _find_exec_unsupported:
+        found = False
+        with closing(_stream_shell_lines(_script(_find_stat_expression(ext_list)), device_serial)) as lines:
+            for line in lines:
+                if line.startswith(_ROOT_MARKER):
+                    root = line[len(_ROOT_MARKER):]
+                    continue
+                info = _parse_stat_line(line)
+                if info is not None:
+                    found = True
+                    yield root, info
+        
+        # Nothing found: either there really is nothing to find, or this
+        # find can't do it. Only the fallback can tell the two apart.
+        if found:
+            return
+    
+    # Fallback: list paths, filter them by extension via grep (grep -iE is
+    # available on all BusyBox), then get size and mtime via stat in batches
+    # (avoids arg-list-too-long), all over one shell session rather than
+    # one adb call per batch
+    grep_cmd = ""
+    if ext_list:
         ext_pattern = '|'.join(ext_list)
-        find_cmd += f" | grep -iE '\.({ext_pattern})$'"
-
+        grep_cmd = f" | grep -iE '\\.({ext_pattern})$'"
+    
+    stat_shell = PersistentShell(device_serial)
+    batch_size = 200
+    batch: list[str] = []
     try:
-        paths_output = shell_command(find_cmd, device_serial)
-    except ADBError:
-        return []
-
-    if not paths_output:
-        return []
+        with closing(_stream_shell_lines(_script('-type f -print', grep_cmd), device_serial)) as lines:
+            for line in lines:
+                is_marker = line.startswith(_ROOT_MARKER)
+                # A batch never spans two roots
+                if batch and (is_marker or len(batch) >= batch_size):
+                    for info in _stat_batch(batch, device_serial, stat_shell):
+                        yield root, info
+                    batch = []
+                
+                if is_marker:
+                    root = line[len(_ROOT_MARKER):]
+                else:
+                    batch.append(line)
+                    # Files exist that the single pass didn't report
+                    _find_exec_unsupported.add(device_serial)
+        
+        if batch:
+            for info in _stat_batch(batch, device_serial, stat_shell):
+                yield root, info
+    finally:
+        stat_shell.close()
 
-    paths = [p.strip() for p in paths_output.strip().split('\n') if p.strip()]
-    if not paths:
-        return []
 
-    files = []
-    # Get size and mtime via stat in batches (avoids arg-list-too-long)
-    batch_size = 200
-    for i in range(0, len(paths), batch_size):
-        batch = paths[i:i + batch_size]
-        quoted = ' '.join(f'"{p}"' for p in batch)
-        # stat -c "%s %Y %n" → "<size> <mtime_epoch> <path>"
-        stat_cmd = f'stat -c "%s %Y %n" {quoted} 2>/dev/null'
-        try:
-            stat_out = shell_command(stat_cmd, device_serial)
-        except ADBError:
-            stat_out = ""
+def iter_media_files(
+    storage_root: str,
+    extensions: set[str],
+    device_serial: Optional[str] = None,
+    exclude_patterns: Optional[list[str]] = None
+) -> Iterator[dict]:
+    """
+    Stream all media files in a storage root.
+    Single-root form of iter_media_files_multi().
+    
+    Args:
+        storage_root: Root path to search (e.g., /storage/emulated/0)
+        extensions: Set of file extensions to find (e.g., {'.jpg', '.mp4'})
+        device_serial: Optional device serial
+        exclude_patterns: Optional list of path patterns to exclude
+    
+    Yields:
+        Dicts with: path, name, size, mtime
+    """
+    with closing(iter_media_files_multi([storage_root], extensions, device_serial, exclude_patterns)) as records:
+        for _, info in records:
+            yield info
 
-        if stat_out.strip():
-            for line in stat_out.strip().split('\n'):
-                if not line.strip():
-                    continue
-                parts = line.split(' ', 2)
-                if len(parts) < 3:
-                    continue
-                try:
-                    size = int(parts[0])
-                    mtime = parts[1]
-                    path = parts[2]
-                    name = path.rsplit('/', 1)[-1] if '/' in path else path
-                    files.append({
-                        'path': path,
-                        'name': name,
-                        'size': size,
-                        'mtime': mtime,
-                        'is_dir': False
-                    })
-                except (ValueError, IndexError):
-                    continue
-        else:
-            # stat not available or failed — include files with zero metadata
-            for path in batch:
-                name = path.rsplit('/', 1)[-1] if '/' in path else path
-                files.append({
-                    'path': path,
-                    'name': name,
-                    'size': 0,
-                    'mtime': '0',
-                    'is_dir': False
-                })
 
-    return files
+def find_media_files(
+    storage_root: str,
+    extensions: set[str],
+    device_serial: Optional[str] = None,
+    exclude_patterns: Optional[list[str]] = None
+) -> list[dict]:
+    """
+    Find all media files in a storage root.
+    List-returning wrapper around iter_media_files().
+    
+    Args:
+        storage_root: Root path to search (e.g., /storage/emulated/0)
+        extensions: Set of file extensions to find (e.g., {'.jpg', '.mp4'})
+        device_serial: Optional device serial
+        exclude_patterns: Optional list of path patterns to exclude
+    
+    Returns:
+        List of dicts with: path, name, size, mtime
+    """
+    return list(iter_media_files(storage_root, extensions, device_serial, exclude_patterns))
@@ -147,7 +147,7 @@ class BackupManager:
         
         return existing
     
-    def analyze_folder(self, folder: MediaFolder, categories: list[str] = None, include_hidden: bool = False) -> tuple[list[FileToSync], list[FileToSync]]:
+    def analyze_folder(self, folder: MediaFolder, categories: list[str] = None, include_hidden: bool = False) -> tuple[list[FileToSync], list[FileToSync], int, int]:
         """
         Analyze a folder to determine what needs to be synced.
         Rsync-like: compares directly with local files.
@@ -156,16 +156,17 @@ class BackupManager:
             folder: MediaFolder to analyze.
         
         Returns:
-            Tuple of (files_to_sync, already_exist)
+            Tuple of (files_to_sync, already_exist, to_sync_bytes, already_exist_bytes)
         """
         if folder.files:
             # Use cached files from scan if available (avoid re-scanning)
             # Filter by category if needed
-            from .scanner import is_file_in_categories
+            from .categories import category_matcher
             if categories:
+                in_categories = category_matcher(categories)
                 all_files = [
                     f for f in folder.files
-                    if is_file_in_categories(f['name'], categories)
+                    if in_categories(f['name'])
                 ]
             else:
                 all_files = folder.files
@@ -188,9 +189,11 @@ class BackupManager:
         
         existing_paths = self._check_files_multithread(files_to_check)
         
-        # Categorize files
+        # Categorize files, totalling their sizes on the way
         to_sync = []
         already_exist = []
+        to_sync_bytes = 0
+        already_exist_bytes = 0
         
         for file_info, local_path in files_with_paths:
             file_to_sync = FileToSync(
@@ -203,27 +206,47 @@ class BackupManager:
             
             if file_to_sync.needs_sync:
                 to_sync.append(file_to_sync)
+                to_sync_bytes += file_to_sync.size
             else:
                 already_exist.append(file_to_sync)
+                already_exist_bytes += file_to_sync.size
         
-        return to_sync, already_exist
+        return to_sync, already_exist, to_sync_bytes, already_exist_bytes
     
-    def analyze_folders(self, folders: list[MediaFolder], categories: list[str] = None, include_hidden: bool = False) -> tuple[list[FileToSync], list[FileToSync]]:
+    def analyze_folders(
+        self,
+        folders: list[MediaFolder],
+        categories: list[str] = None,
+        include_hidden: bool = False,
+        progress_callback: Optional[Callable[[int, int, int], None]] = None
+    ) -> tuple[list[FileToSync], list[FileToSync], int, int]:
         """
         Analyze multiple folders.
         
+        Args:
+            folders: Folders to analyze.
+            progress_callback: Optional callback called after each folder with
+                (folders_done, files_to_sync, to_sync_bytes) so far.
+        
         Returns:
-            Tuple of (all_files_to_sync, all_already_exist)
+            Tuple of (all_files_to_sync, all_already_exist, to_sync_bytes, already_exist_bytes)
         """
         all_to_sync = []
         all_exist = []
+        all_to_sync_bytes = 0
+        all_exist_bytes = 0
         
-        for folder in folders:
-            to_sync, exist = self.analyze_folder(folder, categories, include_hidden)
+        for folders_done, folder in enumerate(folders, 1):
+            to_sync, exist, to_sync_bytes, exist_bytes = self.analyze_folder(folder, categories, include_hidden)
             all_to_sync.extend(to_sync)
             all_exist.extend(exist)
+            all_to_sync_bytes += to_sync_bytes
+            all_exist_bytes += exist_bytes
+            
+            if progress_callback:
+                progress_callback(folders_done, len(all_to_sync), all_to_sync_bytes)
         
-        return all_to_sync, all_exist
+        return all_to_sync, all_exist, all_to_sync_bytes, all_exist_bytes
     
     def start_backup(
         self,
@@ -242,14 +265,39 @@ class BackupManager:
         Returns:
             Final BackupProgress with results.
         """
-        self._cancelled = False
-        
         # Analyze what needs to be synced
-        to_sync, already_exist = self.analyze_folders(folders, categories, include_hidden)
+        to_sync, already_exist, to_sync_bytes, skipped_bytes = self.analyze_folders(folders, categories, include_hidden)
+        
+        return self.backup_files(to_sync, already_exist, to_sync_bytes, skipped_bytes, progress_callback)
+    
+    def backup_files(
+        self,
+        to_sync: list[FileToSync],
+        already_exist: list[FileToSync],
+        to_sync_bytes: int,
+        skipped_bytes: int,
+        progress_callback: Optional[Callable[[BackupProgress], None]] = None
+    ) -> BackupProgress:
+        """
+        Download files already sorted by analyze_folders().
+        
+        Lets a caller that analyzed the folders (e.g. to ask for
+        confirmation) start the backup without analyzing them again.
+        
+        Args:
+            to_sync: Files to download.
+            already_exist: Files already present locally, counted as skipped.
+            to_sync_bytes: Total size of to_sync.
+            skipped_bytes: Total size of already_exist.
+            progress_callback: Optional callback called with BackupProgress updates.
+        
+        Returns:
+            Final BackupProgress with results.
+        """
+        self._cancelled = False
         
         total_files = len(to_sync) + len(already_exist)
-        total_bytes = sum(f.size for f in to_sync) + sum(f.size for f in already_exist)
-        skipped_bytes = sum(f.size for f in already_exist)
+        total_bytes = to_sync_bytes + skipped_bytes
         
         progress = BackupProgress(
             total_files=total_files,
@@ -4,6 +4,7 @@ Defines file type categories, extensions, and classification helpers.
 """
 
 import os
+from typing import Callable
 
 
 # File categories with their extensions
@@ -29,10 +30,13 @@ FILE_CATEGORIES = {
 }
 
 # Legacy compatibility
-IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.heif', '.bmp', '.raw', '.cr2', '.nef', '.arw'}
-VIDEO_EXTENSIONS = {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.3gp', '.m4v'}
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.heif', '.bmp', '.raw', '.cr2', '.nef', '.arw'})
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.3gp', '.m4v'})
 MEDIA_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
 
+# Extension (lowercase, with dot) -> media type, for is_media_file()
+_EXT_TYPE = {e: 'photo' for e in IMAGE_EXTENSIONS} | {e: 'video' for e in VIDEO_EXTENSIONS}
+
 # All known extensions (for "other" category exclusion)
 ALL_KNOWN_EXTENSIONS = set()
 for cat in FILE_CATEGORIES.values():
@@ -112,25 +116,38 @@ def get_file_subcategory(filename: str) -> str:
         return 'Altro'
 
 
-def is_file_in_categories(filename: str, categories: list[str]) -> bool:
-    """Check if a file matches any of the selected categories."""
-    if '.' not in filename:
-        # File without extension - only matches 'other' category
-        ext = ''
-    else:
-        parts = filename.rsplit('.', 1)
-        if len(parts) == 2:
-            ext = '.' + parts[1].lower()
-        else:
-            ext = ''
+def category_matcher(categories: list[str]) -> Callable[[str], bool]:
+    """
+    Build a filename predicate for the selected categories.
+    
+    Same result as is_file_in_categories(), but the extension set is
+    resolved once, so filtering a whole scan costs one lookup per file.
     
+    Args:
+        categories: List of category IDs.
+    
+    Returns:
+        Function taking a filename and returning True if it matches.
+    """
     extensions, include_other = get_extensions_for_categories(categories)
     
-    if ext and ext in extensions:
-        return True
-    if include_other and (not ext or ext not in ALL_KNOWN_EXTENSIONS):
-        return True
-    return False
+    def matches(filename: str) -> bool:
+        dot = filename.rfind('.')
+        # File without extension - only matches 'other' category
+        ext = filename[dot:].lower() if dot >= 0 else ''
+        
+        if ext and ext in extensions:
+            return True
+        if include_other and (not ext or ext not in ALL_KNOWN_EXTENSIONS):
+            return True
+        return False
+    
+    return matches
+
+
+def is_file_in_categories(filename: str, categories: list[str]) -> bool:
+    """Check if a file matches any of the selected categories."""
+    return category_matcher(categories)(filename)
 
 
 def is_media_file(filename: str) -> tuple[bool, str]:
@@ -140,11 +157,11 @@ def is_media_file(filename: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_media, type) where type is 'photo', 'video', or ''
     """
-    ext = filename.lower().rsplit('.', 1)[-1] if '.' in filename else ''
-    ext = f'.{ext}'
-    
-    if ext in IMAGE_EXTENSIONS:
-        return True, 'photo'
-    elif ext in VIDEO_EXTENSIONS:
-        return True, 'video'
+    # Lowercase only the extension, not the whole name
+    dot = filename.rfind('.')
+    if dot < 0:
+        return False, ''
+    media_type = _EXT_TYPE.get(filename[dot:].lower())
+    if media_type:
+        return True, media_type
     return False, ''
@@ -5,8 +5,10 @@ Core dataclasses used throughout the application.
 
 from dataclasses import dataclass, field
 
+from .utils import format_size
 
-@dataclass
+
+@dataclass(slots=True)
 class MediaFolder:
     """Represents a folder containing media files."""
     path: str
@@ -19,6 +21,12 @@ class MediaFolder:
     storage_root: str = ""
     subfolders: list['MediaFolder'] = field(default_factory=list)
     files: list[dict] = field(default_factory=list)
+    _size_human: str = field(init=False, repr=False, compare=False, default='')
+    
+    def __post_init__(self):
+        # Folders aren't modified once the scan has built them, so the size
+        # string is formatted once here instead of on every table refresh
+        self._size_human = format_size(self.total_size)
     
     @property
     def total_count(self) -> int:
@@ -33,18 +41,11 @@ class MediaFolder:
         return self.total_size / (1024 * 1024 * 1024)
     
     def size_human(self) -> str:
-        """Return human-readable size."""
-        if self.total_size >= 1024 * 1024 * 1024:
-            return f"{self.size_gb:.2f} GB"
-        elif self.total_size >= 1024 * 1024:
-            return f"{self.size_mb:.2f} MB"
-        elif self.total_size >= 1024:
-            return f"{self.total_size / 1024:.2f} KB"
-        else:
-            return f"{self.total_size} B"
+        """Return human-readable size (formatted at construction)."""
+        return self._size_human
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """Result of a media scan operation."""
     folders: list[MediaFolder]
@@ -4,17 +4,53 @@ Scans Android device for files by category and calculates statistics.
 Uses fast find command instead of recursive ls for better performance.
 """
 
-from typing import Optional
+import posixpath
+import re
+import shlex
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Optional
 
-from .adb import shell_command, find_media_files, ADBError
+from .adb import (
+    shell_command, iter_media_files, iter_media_files_multi, clear_find_support_cache,
+    PersistentShell, ADBError
+)
 from .models import MediaFolder, ScanResult
 from .categories import (
     FILE_CATEGORIES, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, MEDIA_EXTENSIONS,
     ALL_KNOWN_EXTENSIONS, SKIP_DIRECTORIES, SKIP_HIDDEN_DIRECTORIES, EXPAND_DIRECTORIES,
-    get_extensions_for_categories, get_file_subcategory, is_file_in_categories, is_media_file
+    category_matcher, get_extensions_for_categories, get_file_subcategory,
+    is_media_file
 )
 
 
+# A path component starting with '.' that is not '.' or '..' itself
+_HIDDEN_COMPONENT_RE = re.compile(r'(?:^|/)\.(?!\.?(?:/|$))')
+
+
+# Separates the sections of the storage discovery script's output
+_SECTION_MARKER = '__ANDROSYNC_SECTION__'
+
+# Internal storage paths tried when discovery finds nothing
+_FALLBACK_INTERNAL_ROOTS = ('/storage/self/primary', '/storage/emulated/0', '/sdcard')
+
+
+# get_storage_roots() results per device serial (see clear_storage_roots_cache)
+_storage_roots_cache: dict[Optional[str], dict[str, str]] = {}
+
+
+def clear_storage_roots_cache() -> None:
+    """
+    Forget discovered storage roots, e.g. when the device list is refreshed.
+    
+    Also forgets what was learned about the devices' find, since a refresh
+    may mean a different phone behind the same serial (or none).
+    """
+    _storage_roots_cache.clear()
+    clear_find_support_cache()
+
+
 def get_storage_roots(device_serial: Optional[str] = None) -> dict[str, str]:
     """
     Automatic Android storage discovery. Priority order:
@@ -24,61 +60,48 @@ def get_storage_roots(device_serial: Optional[str] = None) -> dict[str, str]:
       4. /storage/ listing          → UUID-named SD cards not caught above
       5. Hard-coded fallback        → last resort
 
+    Discovery takes two round-trips on one adb shell session: one script
+    gathers all the sources above, a second one checks every candidate
+    path (accessible? symlink target?) at once. Non-empty results are
+    cached per device until clear_storage_roots_cache() is called.
+
     Returns:
         Dict mapping storage path → human-readable label.
     """
-    roots: dict[str, str] = {}
-    seen: set[str] = set()   # tracks both original and resolved paths
+    cached = _storage_roots_cache.get(device_serial)
+    if cached is not None:
+        return dict(cached)
 
-    def _resolve(path: str) -> str:
-        """Follow symlinks on the device; return original on failure."""
-        try:
-            out = shell_command(f'readlink -f "{path}" 2>/dev/null', device_serial)
-            real = out.strip()
-            return real if real else path
-        except ADBError:
-            return path
+    gather_script = (
+        f'echo "$EXTERNAL_STORAGE"; echo {_SECTION_MARKER}; '
+        f'echo "$SECONDARY_STORAGE"; echo {_SECTION_MARKER}; '
+        f'cat /proc/mounts 2>/dev/null; echo {_SECTION_MARKER}; '
+        f'ls -1 /storage/ 2>/dev/null'
+    )
 
-    def _accessible(path: str) -> bool:
-        """True if path is a non-empty directory accessible to adb shell."""
+    with PersistentShell(device_serial) as shell:
         try:
-            out = shell_command(f'ls -1 "{path}" 2>/dev/null | head -1', device_serial)
-            return bool(out.strip())
+            sections = shell.run(gather_script, check=False).split(f'{_SECTION_MARKER}\n')
         except ADBError:
-            return False
+            sections = []
+        sections += [''] * (4 - len(sections))
+        ext_out, sec_out, mounts_out, ls_out = sections[:4]
 
-    def _add(path: str, label: str) -> bool:
-        """Add path if not already seen. Returns True if added."""
-        real = _resolve(path)
-        if path in seen or real in seen:
-            return False
-        roots[path] = label
-        seen.add(path)
-        seen.add(real)
-        return True
+        # Candidate (path, label) pairs, in priority order
+        candidates: list[tuple[str, str]] = []
 
-    # ── 1. $EXTERNAL_STORAGE ─────────────────────────────────────────────────
-    try:
-        ext = shell_command('echo $EXTERNAL_STORAGE', device_serial).strip()
-        if ext and _accessible(ext):
-            _add(ext, "Interno")
-    except ADBError:
-        pass
+        # ── 1. $EXTERNAL_STORAGE ─────────────────────────────────────────────
+        ext = ext_out.strip()
+        if ext:
+            candidates.append((ext, "Interno"))
 
-    # ── 2. $SECONDARY_STORAGE ────────────────────────────────────────────────
-    try:
-        sec = shell_command('echo $SECONDARY_STORAGE', device_serial).strip()
-        if sec:
-            for part in sec.split(':'):
-                part = part.strip()
-                if part and _accessible(part):
-                    _add(part, f"SD Card ({part.rsplit('/', 1)[-1]})")
-    except ADBError:
-        pass
+        # ── 2. $SECONDARY_STORAGE ────────────────────────────────────────────
+        for part in sec_out.strip().split(':'):
+            part = part.strip()
+            if part:
+                candidates.append((part, f"SD Card ({posixpath.basename(part)})"))
 
-    # ── 3. /proc/mounts (fuse / sdcardfs / esdfs) ────────────────────────────
-    try:
-        mounts_out = shell_command('cat /proc/mounts 2>/dev/null', device_serial)
+        # ── 3. /proc/mounts (fuse / sdcardfs / esdfs) ────────────────────────
         for line in mounts_out.strip().split('\n'):
             cols = line.split()
             if len(cols) < 3:
@@ -91,37 +114,97 @@ def get_storage_roots(device_serial: Optional[str] = None) -> dict[str, str]:
             # Ignore deep sub-paths (e.g. /storage/emulated/0/Android)
             if mount_point.count('/') > 3:
                 continue
-            if not _accessible(mount_point):
-                continue
             label = "Interno" if ('emulated' in mount_point or 'self' in mount_point) \
-                    else f"SD Card ({mount_point.rsplit('/', 1)[-1]})"
-            _add(mount_point, label)
-    except ADBError:
-        pass
+                    else f"SD Card ({posixpath.basename(mount_point)})"
+            candidates.append((mount_point, label))
 
-    # ── 4. /storage/ listing ─────────────────────────────────────────────────
-    try:
-        ls_out = shell_command('ls -1 /storage/ 2>/dev/null', device_serial)
+        # ── 4. /storage/ listing ─────────────────────────────────────────────
         for entry in ls_out.strip().split('\n'):
             entry = entry.strip()
             if not entry or entry in ('emulated', 'self'):
                 continue
-            path = f'/storage/{entry}'
-            if _accessible(path):
-                _add(path, f"SD Card ({entry})")
-    except ADBError:
-        pass
+            candidates.append((f'/storage/{entry}', f"SD Card ({entry})"))
+
+        # Probe every candidate (and the fallbacks) in one script: a path is
+        # accessible if it is a non-empty directory, and is resolved through
+        # symlinks so aliases of the same storage are only listed once
+        probe_paths = list(dict.fromkeys(
+            [path for path, _ in candidates] + list(_FALLBACK_INTERNAL_ROOTS)
+        ))
+        probe_script = '; '.join(
+            f'p={shlex.quote(path)}; '
+            f'[ -n "$(ls -1 "$p" 2>/dev/null | head -1)" ] && a=1 || a=0; '
+            f'printf "%s\\t%s\\t%s\\n" "$a" "$(readlink -f "$p" 2>/dev/null)" "$p"'
+            for path in probe_paths
+        )
+        try:
+            probe_out = shell.run(probe_script, check=False)
+        except ADBError:
+            probe_out = ""
+
+    accessible: set[str] = set()
+    resolved: dict[str, str] = {}
+    for line in probe_out.split('\n'):
+        cols = line.split('\t', 2)
+        if len(cols) < 3:
+            continue
+        is_accessible, real, path = cols
+        if is_accessible == '1':
+            accessible.add(path)
+        resolved[path] = real.strip() or path
+
+    roots: dict[str, str] = {}
+    seen: set[str] = set()   # tracks both original and resolved paths
+
+    def _add(path: str, label: str) -> bool:
+        """Add path if not already seen. Returns True if added."""
+        real = resolved.get(path, path)
+        if path in seen or real in seen:
+            return False
+        roots[path] = label
+        seen.add(path)
+        seen.add(real)
+        return True
+
+    for path, label in candidates:
+        if path in accessible:
+            _add(path, label)
 
     # ── 5. Fallback ───────────────────────────────────────────────────────────
     if not roots:
-        for fb in ('/storage/self/primary', '/storage/emulated/0', '/sdcard'):
-            if _accessible(fb):
+        for fb in _FALLBACK_INTERNAL_ROOTS:
+            if fb in accessible:
                 _add(fb, "Interno")
                 break
 
+    # Nothing found may just mean the device isn't ready yet: don't cache it
+    if roots:
+        _storage_roots_cache[device_serial] = dict(roots)
     return roots
 
 
+# First path component of every EXPAND_DIRECTORIES entry: a directory can
+# only need expanding if it starts with one of these
+_EXPAND_FIRST_COMPONENTS = frozenset(e.split('/', 1)[0] for e in EXPAND_DIRECTORIES)
+
+# find exclude lists, built once (see get_exclude_patterns)
+_EXCLUDE_PATTERNS = tuple(SKIP_DIRECTORIES)
+_EXCLUDE_PATTERNS_NO_HIDDEN = _EXCLUDE_PATTERNS + tuple(SKIP_HIDDEN_DIRECTORIES)
+
+
+# Primary storage path on virtually every modern device
+DEFAULT_INTERNAL_ROOT = '/storage/emulated/0'
+
+
+def _default_internal_root_ok(device_serial: Optional[str] = None) -> bool:
+    """True if DEFAULT_INTERNAL_ROOT is a non-empty directory (one adb call)."""
+    try:
+        out = shell_command(f'ls -1 "{DEFAULT_INTERNAL_ROOT}" 2>/dev/null | head -1', device_serial)
+        return bool(out.strip())
+    except ADBError:
+        return False
+
+
 def is_hidden_path(path: str) -> bool:
     """
     Check if path is hidden (file or any parent directory starts with '.').
@@ -132,11 +215,17 @@ def is_hidden_path(path: str) -> bool:
     Returns:
         True if the path or any component starts with '.' (excluding '.' and '..').
     """
-    parts = path.split('/')
-    for part in parts:
-        if part.startswith('.') and part not in ('.', '..'):
-            return True
-    return False
+    return _HIDDEN_COMPONENT_RE.search(path) is not None
+
+
+def get_exclude_patterns(include_hidden: bool = False) -> tuple[str, ...]:
+    """
+    Directories to prune on the device: system dirs always, well-known
+    hidden dirs unless hidden files are included.
+    """
+    if include_hidden:
+        return _EXCLUDE_PATTERNS
+    return _EXCLUDE_PATTERNS_NO_HIDDEN
 
 
 def should_expand_directory(relative_path: str) -> bool:
@@ -148,7 +237,7 @@ def should_expand_directory(relative_path: str) -> bool:
 
 
 def aggregate_files_to_folders(
-    files: list[dict],
+    files: Iterable[dict],
     storage_root: str,
     storage_type: str,
     include_hidden: bool = False
@@ -156,8 +245,12 @@ def aggregate_files_to_folders(
     """
     Aggregate a flat list of files into folder statistics.
     
+    Files are consumed in a single pass, so a generator (e.g. from
+    iter_media_files) can be passed without building a list first.
+    All files must live under storage_root, as find results do.
+    
     Args:
-        files: List of file dicts from find_media_files
+        files: Iterable of file dicts from iter_media_files
         storage_root: The storage root path
         storage_type: Human-readable storage type name
     
@@ -166,76 +259,127 @@ def aggregate_files_to_folders(
     """
     # Filter hidden files if needed
     if not include_hidden:
-        files = [f for f in files if not is_hidden_path(f['path'])]
+        files = (f for f in files if not is_hidden_path(f['path']))
+    
+    # Group files by top-level folder. Keys are relative to storage_root
+    # (this call only ever sees one root), so the full folder path is
+    # built once per folder instead of once per file.
+    # Counters live in parallel arrays indexed by folder, with a single
+    # dict mapping each folder to its index.
+    folder_index: dict[str, int] = {}
+    file_counts = array('q')
+    photo_counts = array('q')
+    video_counts = array('q')
+    sizes = array('q')
+    file_lists: list[list[dict]] = []
+    
+    # Files in the same directory (almost always) land in the same folder,
+    # so the folder index is remembered per directory and the split/expand
+    # work below runs once per directory instead of once per file.
+    dir_index: dict[str, int] = {}
     
-    # Group files by top-level folder
-    folder_stats: dict[str, dict] = {}
+    # Every path starts with storage_root + '/' (find guarantees it)
+    prefix_len = len(storage_root.rstrip('/')) + 1
+    
+    # find lists each directory's files together, so consecutive files
+    # mostly belong to the same folder. Counts for such a run are kept in
+    # locals and added to the folder's counters when the run ends.
+    run_idx = -1
+    run_count = run_photos = run_videos = run_size = 0
+    run_files: list[dict] = []
     
     for file_info in files:
         path = file_info['path']
+        directory = path[:path.rfind('/')]
         
-        # Get path relative to storage root
-        if path.startswith(storage_root):
-            relative = path[len(storage_root):].lstrip('/')
-        else:
-            relative = path
-        
-        parts = relative.split('/')
-        
-        # Determine the grouping folder
-        if len(parts) >= 3 and should_expand_directory('/'.join(parts[:2])):
-            # For Android/media, use 3 levels (Android/media/com.app)
-            top_level = '/'.join(parts[:3])
-        elif len(parts) >= 1:
-            # Use first directory
-            top_level = parts[0]
-        else:
-            top_level = relative
-        
-        top_level_path = f"{storage_root}/{top_level}"
+        idx = dir_index.get(directory)
+        if idx is None:
+            # Get path relative to storage root
+            relative = path[prefix_len:]
+            
+            # Only the first three components matter for grouping, so don't
+            # split the rest of the path
+            parts = relative.split('/', 3)
+            
+            # Determine the grouping folder
+            if (len(parts) >= 3 and parts[0] in _EXPAND_FIRST_COMPONENTS
+                    and should_expand_directory(f"{parts[0]}/{parts[1]}")):
+                # For Android/media, use 3 levels (Android/media/com.app)
+                top_level = f"{parts[0]}/{parts[1]}/{parts[2]}"
+                depth = 3
+            elif len(parts) >= 1:
+                # Use first directory
+                top_level = parts[0]
+                depth = 1
+            else:
+                top_level = relative
+                depth = 1
+            
+            idx = folder_index.setdefault(top_level, len(file_lists))
+            if idx == len(file_lists):
+                # First file of a new folder
+                file_counts.append(0)
+                photo_counts.append(0)
+                video_counts.append(0)
+                sizes.append(0)
+                file_lists.append([])
+            
+            # Only remember it if the folder is a parent directory, not the
+            # file itself (e.g. a file directly in the storage root)
+            if len(parts) > depth:
+                dir_index[directory] = idx
         
-        if top_level_path not in folder_stats:
-            folder_stats[top_level_path] = {
-                'name': top_level,
-                'files': 0,
-                'photos': 0,
-                'videos': 0,
-                'size': 0,
-                'file_list': []
-            }
+        if idx != run_idx:
+            # New run: add the finished one to its folder's counters
+            if run_idx >= 0:
+                file_counts[run_idx] += run_count
+                photo_counts[run_idx] += run_photos
+                video_counts[run_idx] += run_videos
+                sizes[run_idx] += run_size
+            run_idx = idx
+            run_count = run_photos = run_videos = run_size = 0
+            run_files = file_lists[idx]
         
         # Track total files
-        folder_stats[top_level_path]['files'] += 1
-        folder_stats[top_level_path]['size'] += file_info['size']
-        folder_stats[top_level_path]['file_list'].append(file_info)
+        run_count += 1
+        run_size += file_info['size']
+        run_files.append(file_info)
         
         # Categorize file for stats
         is_media, media_type = is_media_file(file_info['name'])
         if is_media:
             if media_type == 'photo':
-                folder_stats[top_level_path]['photos'] += 1
+                run_photos += 1
             else:
-                folder_stats[top_level_path]['videos'] += 1
+                run_videos += 1
+    
+    if run_idx >= 0:
+        file_counts[run_idx] += run_count
+        photo_counts[run_idx] += run_photos
+        video_counts[run_idx] += run_videos
+        sizes[run_idx] += run_size
+    
+    # Sort by total count descending on the counter column itself, then
+    # create the MediaFolder objects already in that order
+    names = list(folder_index)  # insertion order == folder index
+    order = sorted(range(len(names)), key=file_counts.__getitem__, reverse=True)
     
-    # Create MediaFolder objects
     folders = []
-    for path, stats in folder_stats.items():
+    for idx in order:
+        top_level = names[idx]
         folder = MediaFolder(
-            path=path,
-            name=stats['name'],
-            file_count=stats['files'],
-            photo_count=stats['photos'],
-            video_count=stats['videos'],
-            total_size=stats['size'],
+            path=f"{storage_root}/{top_level}",
+            name=top_level,
+            file_count=file_counts[idx],
+            photo_count=photo_counts[idx],
+            video_count=video_counts[idx],
+            total_size=sizes[idx],
             storage_type=storage_type,
             storage_root=storage_root,
-            files=stats['file_list']
+            files=file_lists[idx]
         )
         folders.append(folder)
     
-    # Sort by total count descending
-    folders.sort(key=lambda f: f.total_count, reverse=True)
-    
     return folders
 
 
@@ -247,7 +391,8 @@ def scan_media_folders(
     categories: list[str] = None,
     additional_paths: Optional[list[str]] = None,
     include_hidden: bool = False,
-    progress_callback: Optional[callable] = None
+    progress_callback: Optional[callable] = None,
+    fast_path: bool = False
 ) -> ScanResult:
     """
     Scan selected storage for media folders on the device.
@@ -262,6 +407,9 @@ def scan_media_folders(
         additional_paths: Additional paths to scan beyond auto-discovered storage.
         include_hidden: Whether to include hidden files/directories (starting with '.').
         progress_callback: Optional callback(message, index, total) for progress.
+        fast_path: When only internal storage is requested, use
+            DEFAULT_INTERNAL_ROOT directly if it is readable and skip storage
+            discovery. Falls back to get_storage_roots() otherwise.
     
     Returns:
         ScanResult with all found media folders and totals.
@@ -269,6 +417,8 @@ def scan_media_folders(
     if storage_paths:
         # Use provided paths directly
         storage_roots = storage_paths.copy()
+    elif fast_path and scan_internal and not scan_sdcard and _default_internal_root_ok(device_serial):
+        storage_roots = {DEFAULT_INTERNAL_ROOT: "Interno"}
     else:
         # Get all storage roots with their types
         all_roots = get_storage_roots(device_serial)
@@ -288,7 +438,6 @@ def scan_media_folders(
     
     all_folders: list[MediaFolder] = []
     total_roots = len(storage_roots)
-    all_files_scanned = []  # Track all files for stats
     
     # Determine extensions to scan
     categories = categories or ['media']
@@ -296,69 +445,89 @@ def scan_media_folders(
     
     # If "other" is included, we need to scan everything
     scan_extensions = {'*'} if include_other else extensions
+    in_categories = category_matcher(categories)
+    
+    exclude = get_exclude_patterns(include_hidden)
     
-    for idx, (root, storage_type) in enumerate(storage_roots.items()):
+    # --- Diagnostic: verify the paths exist and are accessible ---
+    # Checked up front on one shell; each result is reported when the scan
+    # of its root actually starts
+    diagnostics: dict[str, str] = {}
+    with PersistentShell(device_serial) as shell:
+        for root in storage_roots:
+            try:
+                ls_out = shell.run(f'ls -1 "{root}" 2>/dev/null | head -5')
+                ls_lines = [l for l in ls_out.strip().split('\n') if l.strip()]
+                if ls_lines:
+                    preview = ', '.join(ls_lines[:5])
+                    diagnostics[root] = f"  Path OK — contenuto: {preview}{'...' if len(ls_lines) >= 5 else ''}"
+                else:
+                    diagnostics[root] = f"  ATTENZIONE: {root} è vuoto o non accessibile"
+            except Exception:
+                diagnostics[root] = f"  ATTENZIONE: impossibile leggere {root}"
+    
+    roots = list(storage_roots)
+    
+    def report_root_started(idx: int):
         if progress_callback:
-            progress_callback(f"Scansione {storage_type}: {root}", idx, total_roots)
-        
-        # --- Diagnostic: verify the path exists and is accessible ---
-        try:
-            ls_out = shell_command(f'ls -1 "{root}" 2>/dev/null | head -5', device_serial)
-            ls_lines = [l for l in ls_out.strip().split('\n') if l.strip()]
-            if ls_lines:
-                preview = ', '.join(ls_lines[:5])
-                if progress_callback:
-                    progress_callback(f"  Path OK — contenuto: {preview}{'...' if len(ls_lines) >= 5 else ''}", idx, total_roots)
-            else:
-                if progress_callback:
-                    progress_callback(f"  ATTENZIONE: {root} è vuoto o non accessibile", idx, total_roots)
-        except Exception:
-            if progress_callback:
-                progress_callback(f"  ATTENZIONE: impossibile leggere {root}", idx, total_roots)
-        
-        # Build exclude list: always skip system dirs, conditionally skip hidden dirs
-        exclude = list(SKIP_DIRECTORIES)
-        if not include_hidden:
-            exclude.extend(SKIP_HIDDEN_DIRECTORIES)
-        
-        # Use fast find command
-        files = find_media_files(
-            storage_root=root,
+            root = roots[idx]
+            progress_callback(f"Scansione {storage_roots[root]}: {root}", idx, total_roots)
+            progress_callback(diagnostics[root], idx, total_roots)
+    
+    def report_root_done(idx: int, folders: list[MediaFolder]):
+        if progress_callback:
+            file_count = sum(f.file_count for f in folders)
+            progress_callback(f"Analisi {file_count} file da {storage_roots[roots[idx]]}...", idx, total_roots)
+    
+    # One find over all roots in a single adb call. Records arrive grouped
+    # by root, in scan order, so each root is reported and aggregated as
+    # its records stream in, filtering by category (especially for "Other"
+    # category logic)
+    next_idx = 0  # Roots before this index have been reported
+    if storage_roots:
+        records = iter_media_files_multi(
+            storage_roots=roots,
             extensions=scan_extensions,
             device_serial=device_serial,
             exclude_patterns=exclude
         )
-        
-        # Filter files if needed (especially for "Other" category logic)
-        if files:
-            filtered_files = [
-                f for f in files 
-                if is_file_in_categories(f['name'], categories)
-            ]
-            files = filtered_files
-            all_files_scanned.extend(files)  # Track for stats
-        
-        if progress_callback:
-            progress_callback(f"Analisi {len(files)} file da {storage_type}...", idx, total_roots)
-        
-        if files:
-            folders = aggregate_files_to_folders(files, root, storage_type, include_hidden)
+        for root, group in groupby(records, key=itemgetter(0)):
+            idx = roots.index(root)
+            # Roots before this one that produced no record at all
+            for skipped_idx in range(next_idx, idx):
+                report_root_started(skipped_idx)
+                report_root_done(skipped_idx, [])
+            next_idx = max(next_idx, idx + 1)
+            
+            report_root_started(idx)
+            files = (info for _, info in group if in_categories(info['name']))
+            folders = aggregate_files_to_folders(
+                files, root, storage_roots[root], include_hidden
+            )
+            report_root_done(idx, folders)
             all_folders.extend(folders)
     
+    for idx in range(next_idx, total_roots):
+        report_root_started(idx)
+        report_root_done(idx, [])
+    
     # Sort by total count descending
-    all_folders.sort(key=lambda f: f.total_count, reverse=True)
+    all_folders.sort(key=lambda f: f.file_count, reverse=True)
     
     # Calculate totals and file type statistics
-    total_photos = sum(f.photo_count for f in all_folders)
-    total_videos = sum(f.video_count for f in all_folders)
-    total_files = sum(f.file_count for f in all_folders)
-    total_size = sum(f.total_size for f in all_folders)
+    total_photos = total_videos = total_files = total_size = 0
+    for f in all_folders:
+        total_photos += f.photo_count
+        total_videos += f.video_count
+        total_files += f.file_count
+        total_size += f.total_size
     
-    # Calculate file type breakdown from all scanned files
+    # Calculate file type breakdown from the files kept in the folders
     file_stats = {}
-    for file_info in all_files_scanned:
-        subcat = get_file_subcategory(file_info['name'])
-        file_stats[subcat] = file_stats.get(subcat, 0) + 1
+    for folder in all_folders:
+        for file_info in folder.files:
+            subcat = get_file_subcategory(file_info['name'])
+            file_stats[subcat] = file_stats.get(subcat, 0) + 1
     
     return ScanResult(
         folders=all_folders,
@@ -391,23 +560,19 @@ def get_all_media_files(
     categories = categories or ['media']
     extensions, include_other = get_extensions_for_categories(categories)
     scan_extensions = {'*'} if include_other else extensions
+    in_categories = category_matcher(categories)
     
-    # Build exclude list based on include_hidden
-    exclude = list(SKIP_DIRECTORIES)
-    if not include_hidden:
-        exclude.extend(SKIP_HIDDEN_DIRECTORIES)
-    
-    files = find_media_files(
-        storage_root=folder.path,
-        extensions=scan_extensions,
-        device_serial=device_serial,
-        exclude_patterns=exclude
-    )
+    exclude = get_exclude_patterns(include_hidden)
     
     # Filter files strictly
     filtered = [
-        f for f in files 
-        if is_file_in_categories(f['name'], categories)
+        f for f in iter_media_files(
+            storage_root=folder.path,
+            extensions=scan_extensions,
+            device_serial=device_serial,
+            exclude_patterns=exclude
+        )
+        if in_categories(f['name'])
     ]
     
     # Filter hidden if needed
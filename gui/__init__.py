@@ -1,6 +1,6 @@
 # GUI Interface
 
-from .workers import ScanWorker, BackupWorker, AnalyzeWorker
+from .workers import ScanWorker, BackupWorker, AnalyzeWorker, DeviceCheckWorker, StorageCheckWorker, LogWriterThread
 from .dialogs import StorageSelectionDialog, CategorySelectionDialog
-from .widgets import NumericTreeWidgetItem
+from .models import FolderTableModel, CheckableListModel
 from .styles import get_stylesheet
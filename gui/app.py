@@ -5,30 +5,77 @@ PySide6-based graphical interface for Android Media Backup.
 
 import os
 import sys
+from functools import lru_cache
 from typing import Optional
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QTreeWidget, QTreeWidgetItem, QProgressBar,
-    QTextEdit, QFileDialog, QMessageBox, QFrame, QSplitter, QHeaderView,
+    QLabel, QPushButton, QTreeView, QProgressBar,
+    QPlainTextEdit, QFileDialog, QMessageBox, QFrame, QSplitter, QHeaderView,
     QCheckBox, QDialog
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QThreadPool, QSettings, QSortFilterProxyModel
 from PySide6.QtGui import QFont
 
-from core.adb import check_adb_available, get_connected_devices, ADBError
-from core.scanner import scan_media_folders, ScanResult, get_storage_roots
+from core.scanner import scan_media_folders, ScanResult, clear_storage_roots_cache
 from core.categories import FILE_CATEGORIES
 from core.models import MediaFolder
 from core.utils import format_size
 from core.backup import BackupProgress, BackupStatus
 
-from .workers import ScanWorker, BackupWorker, AnalyzeWorker
+from .workers import ScanWorker, BackupWorker, AnalyzeWorker, DeviceCheckWorker, StorageCheckWorker, LogWriterThread
 from .dialogs import StorageSelectionDialog, CategorySelectionDialog
-from .widgets import NumericTreeWidgetItem
+from .models import FolderTableModel
 from .styles import get_stylesheet
 
 
+# Category -> subcategories shown in the statistics panel
+_CATEGORY_SUBCATS = {
+    'media': ('Foto', 'Video'),
+    'documents': ('PDF', 'Word', 'Excel', 'PowerPoint', 'Testo', 'Dati'),
+    'apk': ('APK',),
+    'other': ('Altro',),
+}
+
+# Subcategory -> emoji, for visual appeal
+_SUBCAT_EMOJI = {
+    'Foto': '📷',
+    'Video': '🎥',
+    'PDF': '📄',
+    'Word': '📝',
+    'Excel': '📊',
+    'PowerPoint': '📽️',
+    'Testo': '📃',
+    'APK': '📦',
+    'Dati': '💾',
+    'Altro': '📁',
+}
+
+# Placeholder texts cycled while a scan runs
+_SCAN_FRAMES = ("Scansione", "Scansione.", "Scansione..", "Scansione...")
+
+
+@lru_cache(maxsize=None)
+def _font(point_size: int, bold: bool = False, family: str = "") -> QFont:
+    """
+    Return a shared font, built on first use.
+    
+    Fonts can only be created once a QApplication exists, so they are
+    cached lazily rather than built at import; setFont copies the value.
+    """
+    font = QFont(family, point_size)
+    if bold:
+        font.setWeight(QFont.Weight.Bold)
+    return font
+
+
+# Lines kept in the on-screen log
+_LOG_MAX_LINES = 5000
+
+# Delay before buffered log messages are shown
+_LOG_FLUSH_INTERVAL_MS = 100
+
+
 class MainWindow(QMainWindow):
     """Main application window."""
     
@@ -38,14 +85,21 @@ class MainWindow(QMainWindow):
         self.destination: Optional[str] = None
         self.scan_worker: Optional[ScanWorker] = None
         self.analyze_worker: Optional[AnalyzeWorker] = None
+        # Selection dialogs, built on first use and reused afterwards
+        self._category_dialog: Optional[CategorySelectionDialog] = None
+        self._storage_dialog: Optional[StorageSelectionDialog] = None
         self.backup_worker: Optional[BackupWorker] = None
+        self.backup_progress_timer: Optional[QTimer] = None
+        self._close_after_backup = False  # Window closed while a backup was stopping
+        self.device_check_worker: Optional[DeviceCheckWorker] = None
+        self.storage_check_worker: Optional[StorageCheckWorker] = None
         self.is_scanning = False
         self.scan_animation_timer: Optional[QTimer] = None
         self.scan_animation_dots = 0
         self.available_storage: dict[str, str] = {}  # path -> name
         self.selected_storage: dict[str, str] = {}   # path -> name
         self.selected_categories: list[str] = ['media']
-        self._last_logged_file: Optional[str] = None  # Track last logged file
+        self._shown_progress: Optional[BackupProgress] = None  # Last backup snapshot displayed
         self._scan_is_stale = False  # Track if scan needs refresh
         
         # Device and parameters
@@ -53,10 +107,14 @@ class MainWindow(QMainWindow):
         self.connected_devices: list = []  # List of connected devices
         self.include_hidden: bool = False  # Include hidden files flag
         
-        self.log_file = None # Initialize log file handle
+        self.settings = QSettings("androsync", "androsync")  # Persisted preferences
+        
+        self.log_writer: Optional[LogWriterThread] = None  # Writes the log file
+        self._log_buffer: list[str] = []  # Messages not yet shown in the log pane
         self.setup_logging() # Call setup_logging
         
         self.init_ui()
+        self.restore_destination()
         self.check_device()
     
     def setup_logging(self):
@@ -72,13 +130,10 @@ class MainWindow(QMainWindow):
         filename = f"gui_{timestamp}.log"
         log_path = os.path.join(log_dir, filename)
         
-        try:
-            self.log_file = open(log_path, 'a', encoding='utf-8', buffering=1)  # Line buffered
-            # Write header
-            self.log_file.write(f"=== AndroSync GUI Log Started: {timestamp} ===\n")
-        except OSError as e:
-            print(f"Failed to create log file: {e}")
-            self.log_file = None # Ensure it's None if creation failed
+        # The file is opened and written on the writer's own thread
+        self.log_writer = LogWriterThread(log_path, self)
+        self.log_writer.write(f"=== AndroSync GUI Log Started: {timestamp} ===")
+        self.log_writer.start()
 
     def init_ui(self):
         """Initialize the user interface."""
@@ -116,6 +171,8 @@ class MainWindow(QMainWindow):
         splitter.addWidget(log_container)
         
         splitter.setSizes([400, 50, 200])
+        # Dragging the stats panel back open renders any pending stats
+        splitter.splitterMoved.connect(self.refresh_stats_display)
         layout.addWidget(splitter)
         
         # Progress bar
@@ -140,14 +197,14 @@ class MainWindow(QMainWindow):
         
         # Title
         title = QLabel("AndroSync")
-        title.setFont(QFont("", 16, QFont.Weight.Bold))
+        title.setFont(_font(16, bold=True))
         layout.addWidget(title)
         
         layout.addStretch()
         
         # Device status
         self.device_label = QLabel("Ricerca dispositivo...")
-        self.device_label.setFont(QFont("", 11))
+        self.device_label.setFont(_font(11))
         layout.addWidget(self.device_label)
         
         # Device selector combobox (for multiple devices)
@@ -159,10 +216,10 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.device_combo)
         
         # Refresh button
-        refresh_btn = QPushButton("Aggiorna")
-        refresh_btn.setToolTip("Aggiorna lista dispositivi")
-        refresh_btn.clicked.connect(self.check_device)
-        layout.addWidget(refresh_btn)
+        self.refresh_btn = QPushButton("Aggiorna")
+        self.refresh_btn.setToolTip("Aggiorna lista dispositivi")
+        self.refresh_btn.clicked.connect(self.check_device)
+        layout.addWidget(self.refresh_btn)
         
         return frame
     
@@ -181,7 +238,7 @@ class MainWindow(QMainWindow):
         storage_layout.addWidget(self.storage_btn)
         
         self.storage_label = QLabel("Nessuno")
-        self.storage_label.setFont(QFont("", 10))
+        self.storage_label.setFont(_font(10))
         self.storage_label.setStyleSheet("color: #888;")
         storage_layout.addWidget(self.storage_label)
         layout.addLayout(storage_layout)
@@ -195,7 +252,7 @@ class MainWindow(QMainWindow):
         cat_layout.addWidget(self.category_btn)
         
         self.category_label = QLabel("Media")
-        self.category_label.setFont(QFont("", 10))
+        self.category_label.setFont(_font(10))
         self.category_label.setStyleSheet("color: #888;")
         cat_layout.addWidget(self.category_label)
         layout.addLayout(cat_layout)
@@ -213,7 +270,14 @@ class MainWindow(QMainWindow):
     
     def open_category_dialog(self):
         """Open dialog to select categories."""
-        dialog = CategorySelectionDialog(self, self.selected_categories, self.include_hidden)
+        dialog = self._category_dialog
+        if dialog is None:
+            dialog = self._category_dialog = CategorySelectionDialog(
+                self, self.selected_categories, self.include_hidden
+            )
+        else:
+            dialog.reset(self.selected_categories, self.include_hidden)
+        
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.selected_categories = dialog.get_selected_categories()
             self.include_hidden = dialog.get_include_hidden()
@@ -242,17 +306,17 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Errore", "Nessuno storage disponibile")
             return
         
-        dialog = StorageSelectionDialog(self.available_storage, self)
-        
-        # Pre-select previously selected items
-        if self.selected_storage:
-            for i in range(dialog.list_widget.count()):
-                item = dialog.list_widget.item(i)
-                path = item.data(Qt.ItemDataRole.UserRole)
-                if path in self.selected_storage:
-                    item.setCheckState(Qt.CheckState.Checked)
-                else:
-                    item.setCheckState(Qt.CheckState.Unchecked)
+        # Previously selected items start out checked; the dialog is only
+        # rebuilt when the device reports different storage
+        dialog = self._storage_dialog
+        if dialog is None or dialog.available_storage != self.available_storage:
+            if dialog is not None:
+                dialog.deleteLater()
+            dialog = self._storage_dialog = StorageSelectionDialog(
+                self.available_storage, self, self.selected_storage
+            )
+        else:
+            dialog.reset(self.selected_storage)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.selected_storage = dialog.get_selected_storage()
@@ -290,7 +354,7 @@ class MainWindow(QMainWindow):
         header_layout = QHBoxLayout()
         
         label = QLabel("Cartelle Media")
-        label.setFont(QFont("", 12, QFont.Weight.Bold))
+        label.setFont(_font(12, bold=True))
         header_layout.addWidget(label)
         
         header_layout.addStretch()
@@ -304,20 +368,34 @@ class MainWindow(QMainWindow):
         
         layout.addLayout(header_layout)
         
-        # Tree widget
-        self.folder_tree = QTreeWidget()
-        self.folder_tree.setHeaderLabels(["Cartella", "Storage", "File", "Dimensione"])
+        # Folder model: rows live in Python lists and the view only asks
+        # for the visible cells; the proxy sorts on numeric values
+        self.folder_model = FolderTableModel(self)
+        self.folder_model.checked_count_changed.connect(self.on_checked_count_changed)
+        self.folder_proxy = QSortFilterProxyModel(self)
+        self.folder_proxy.setSourceModel(self.folder_model)
+        self.folder_proxy.setSortRole(FolderTableModel.SORT_ROLE)
+        
+        # Tree view
+        self.folder_tree = QTreeView()
+        self.folder_tree.setModel(self.folder_proxy)
         self.folder_tree.setRootIsDecorated(False)
         self.folder_tree.setAlternatingRowColors(False)
-        self.folder_tree.itemChanged.connect(self.on_item_changed)
+        # Flat list of single-line rows: measure one row instead of each,
+        # and skip expand handling and its animation altogether
+        self.folder_tree.setUniformRowHeights(True)
+        self.folder_tree.setItemsExpandable(False)
+        self.folder_tree.setAnimated(False)
         self.folder_tree.setSortingEnabled(True)
-        self.folder_tree.sortByColumn(4, Qt.SortOrder.DescendingOrder)  # Sort by total by default
+        self.folder_tree.sortByColumn(2, Qt.SortOrder.DescendingOrder)  # Sort by file count by default
         
         header = self.folder_tree.header()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        # Fit those columns to the rows on screen only, not to the first 1000
+        header.setResizeContentsPrecision(0)
         header.setSortIndicatorShown(True)
         header.setSectionsClickable(True)
         
@@ -339,52 +417,50 @@ class MainWindow(QMainWindow):
         
         # Title
         title = QLabel("Statistiche")
-        title.setFont(QFont("", 10, QFont.Weight.Bold))
+        title.setFont(_font(10, bold=True))
         layout.addWidget(title)
         
         # Stats label (will be populated after scan)
         self.stats_label = QLabel("Nessuna scansione effettuata")
-        self.stats_label.setFont(QFont("", 10))
+        self.stats_label.setFont(_font(10))
         self.stats_label.setWordWrap(True)
         layout.addWidget(self.stats_label)
+        self._stats_result: Optional[ScanResult] = None
+        self._stats_dirty = False
         
         return frame
     
     def update_stats_display(self, result):
-        """Update statistics display based on scan result and selected categories."""
+        """
+        Show the statistics of a scan result for the selected categories.
+        
+        The text is only built once the stats panel is actually on screen:
+        while it is collapsed by the splitter (or the window is minimized)
+        the result is kept and rendered by refresh_stats_display later.
+        """
+        self._stats_result = result
+        self._stats_dirty = True
+        self.refresh_stats_display()
+    
+    def refresh_stats_display(self, *_):
+        """Render pending statistics if the stats panel is visible."""
+        if not self._stats_dirty or self.stats_label.visibleRegion().isEmpty():
+            return
+        self._stats_dirty = False
+        
+        result = self._stats_result
         if not result or not result.file_stats:
             self.stats_label.setText("Nessun file trovato")
             return
         
-        # Map categories to relevant subcategories
-        category_subcats = {
-            'media': ['Foto', 'Video'],
-            'documents': ['PDF', 'Word', 'Excel', 'PowerPoint', 'Testo', 'Dati'],
-            'apk': ['APK'],
-            'other': ['Altro']
-        }
-        
         # Collect relevant stats based on selected categories
+        file_stats = result.file_stats
         stats_parts = []
         for category in self.selected_categories:
-            subcats = category_subcats.get(category, [])
-            for subcat in subcats:
-                if subcat in result.file_stats:
-                    count = result.file_stats[subcat]
-                    # Add emoji for visual appeal
-                    emoji = {
-                        'Foto': '📷',
-                        'Video': '🎥',
-                        'PDF': '📄',
-                        'Word': '📝',
-                        'Excel': '📊',
-                        'PowerPoint': '📽️',
-                        'Testo': '📃',
-                        'APK': '📦',
-                        'Dati': '💾',
-                        'Altro': '📁'
-                    }.get(subcat, '📄')
-                    stats_parts.append(f"{emoji} {subcat}: {count:,}")
+            for subcat in _CATEGORY_SUBCATS.get(category, ()):
+                if subcat in file_stats:
+                    emoji = _SUBCAT_EMOJI.get(subcat, '📄')
+                    stats_parts.append(f"{emoji} {subcat}: {file_stats[subcat]:,}")
         
         if stats_parts:
             self.stats_label.setText("  |  ".join(stats_parts))
@@ -398,14 +474,23 @@ class MainWindow(QMainWindow):
         layout.setContentsMargins(0, 0, 0, 0)
         
         label = QLabel("Log")
-        label.setFont(QFont("", 12, QFont.Weight.Bold))
+        label.setFont(_font(12, bold=True))
         layout.addWidget(label)
         
-        self.log_text = QTextEdit()
+        # Plain-text, append-only log; old lines are dropped past the cap
+        # (the log file keeps everything)
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setFont(QFont("Monospace", 10))
+        self.log_text.setMaximumBlockCount(_LOG_MAX_LINES)
+        self.log_text.setFont(_font(10, family="Monospace"))
         layout.addWidget(self.log_text)
         
+        # Coalesces bursts of messages into one append
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.setSingleShot(True)
+        self.log_flush_timer.setInterval(_LOG_FLUSH_INTERVAL_MS)
+        self.log_flush_timer.timeout.connect(self.flush_log)
+        
         return container
     
     def create_controls(self) -> QWidget:
@@ -441,27 +526,43 @@ class MainWindow(QMainWindow):
         return frame
     
     def apply_style(self):
-        """Apply application stylesheet."""
-        self.setStyleSheet(get_stylesheet())
+        """
+        Apply the stylesheet to the whole application.
+        
+        Set once on the QApplication rather than per window, so Qt parses
+        it a single time and every dialog and message box inherits it.
+        """
+        app = QApplication.instance()
+        stylesheet = get_stylesheet()
+        if app.styleSheet() != stylesheet:
+            app.setStyleSheet(stylesheet)
     
     def log(self, message: str):
         """Add message to log."""
-        self.log_text.append(message)
-        # Auto scroll to bottom
-        scrollbar = self.log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
-        
-        # Write to log file (auto-flushed with line buffering)
-        if self.log_file and not self.log_file.closed:
-            try:
-                self.log_file.write(message + '\n')
-            except OSError:
-                pass
+        # Shown on the next flush, so a burst costs a single layout pass
+        self._log_buffer.append(message)
+        if not self.log_flush_timer.isActive():
+            self.log_flush_timer.start()
+        
+        # Written to the log file by the writer thread
+        if self.log_writer:
+            self.log_writer.write(message)
+    
+    def flush_log(self):
+        """Show the buffered log messages in the log pane."""
+        if self._log_buffer:
+            # Follows the end of the log unless the user scrolled up
+            self.log_text.appendPlainText("\n".join(self._log_buffer))
+            self._log_buffer.clear()
     
     def check_device(self):
         """Check for connected Android device and detect available storage."""
+        if self.device_check_worker:
+            return  # A check is already running
+        
         self.device_label.setText("Ricerca dispositivo...")
-        self.folder_tree.clear()
+        self.refresh_btn.setEnabled(False)
+        self.clear_folder_tree()
         self.summary_label.setText("")
         self.select_all_checkbox.setEnabled(False)
         self.scan_btn.setEnabled(False)
@@ -470,69 +571,92 @@ class MainWindow(QMainWindow):
         self.selected_storage = {}
         self.storage_label.setText("Nessuno storage selezionato")
         
+        # A re-check may follow a reconnect or an SD card change
+        clear_storage_roots_cache()
+        
+        # adb may need to start its server: probe off the GUI thread
+        self.device_check_worker = DeviceCheckWorker()
+        self.device_check_worker.signals.finished.connect(self.on_device_check_finished)
+        QThreadPool.globalInstance().start(self.device_check_worker)
+    
+    def on_device_check_finished(self, adb_available: bool, authorized: list, storage: dict, error: str):
+        """
+        Show the outcome of a device check.
+        
+        Args:
+            adb_available: Whether the adb binary was found.
+            authorized: Connected devices in the "device" state.
+            storage: Storage roots of the first authorized device.
+            error: ADB error message, or empty if none occurred.
+        """
+        self.device_check_worker = None
+        self.refresh_btn.setEnabled(True)
+        
         # Check ADB
-        if not check_adb_available():
+        if not adb_available:
             self.device_label.setText("[ERRORE] ADB non trovato")
             self.log("ERRORE: ADB non disponibile. Installa Android SDK Platform Tools.")
             return
         
-        # Check device
-        try:
-            devices = get_connected_devices()
-            authorized = [d for d in devices if d.status == "device"]
-            
-            if len(authorized) == 0:
-                self.device_label.setText("[ERRORE] Nessun dispositivo")
-                self.device_combo.hide()
-                self.connected_devices = []
-                self.device_serial = None
-                self.log("ERRORE: Nessun dispositivo Android connesso.")
-                self.log("   - Assicurati che il dispositivo sia collegato via USB")
-                self.log("   - Attiva il debug USB nelle impostazioni sviluppatore")
-                self.log("   - Autorizza il computer sul dispositivo")
-                return
-            
-            # Store connected devices and populate combobox
-            self.connected_devices = authorized
-            
-            if len(authorized) > 1:
-                # Multiple devices: show combobox
-                self.device_label.setText("[OK] Seleziona dispositivo:")
-                self.device_combo.clear()
-                for dev in authorized:
-                    self.device_combo.addItem(f"{dev.model} ({dev.serial})", dev.serial)
-                self.device_combo.show()
-                
-                # Set current device_serial from combobox
-                self.device_serial = self.device_combo.currentData()
-                
-                self.log(f"[OK] {len(authorized)} dispositivi connessi. Seleziona uno dal menu.")
-            else:
-                # Single device: hide combobox, use directly
-                device = authorized[0]
-                self.device_serial = device.serial
-                self.device_combo.hide()
-                self.device_label.setText(f"[OK] {device.model}")
-                self.log(f"[OK] Dispositivo connesso: {device.model} ({device.serial})")
-            
-            # Detect available storage
-            self.log("Rilevamento storage disponibili...")
-            self.available_storage = get_storage_roots(self.device_serial)
-            
-            if self.available_storage:
-                storage_list = ", ".join(self.available_storage.values())
-                self.log(f"[OK] Storage trovati: {storage_list}")
-                self.storage_btn.setEnabled(True)
-                self.log("Clicca 'Seleziona Storage' per scegliere cosa scansionare")
-            else:
-                self.log("ERRORE: Nessuno storage rilevato sul dispositivo")
-            
-        except ADBError as e:
+        if error:
             self.device_label.setText("[ERRORE] ADB")
             self.device_combo.hide()
             self.connected_devices = []
             self.device_serial = None
-            self.log(f"ERRORE ADB: {e}")
+            self.log(f"ERRORE ADB: {error}")
+            return
+        
+        # Check device
+        if len(authorized) == 0:
+            self.device_label.setText("[ERRORE] Nessun dispositivo")
+            self.device_combo.hide()
+            self.connected_devices = []
+            self.device_serial = None
+            self.log("ERRORE: Nessun dispositivo Android connesso.")
+            self.log("   - Assicurati che il dispositivo sia collegato via USB")
+            self.log("   - Attiva il debug USB nelle impostazioni sviluppatore")
+            self.log("   - Autorizza il computer sul dispositivo")
+            return
+        
+        # Store connected devices and populate combobox
+        self.connected_devices = authorized
+        
+        if len(authorized) > 1:
+            # Multiple devices: show combobox
+            self.device_label.setText("[OK] Seleziona dispositivo:")
+            # The worker already detected the first device's storage: don't
+            # let filling the combobox re-detect it
+            self.device_combo.blockSignals(True)
+            self.device_combo.clear()
+            for dev in authorized:
+                self.device_combo.addItem(f"{dev.model} ({dev.serial})", dev.serial)
+            self.device_combo.blockSignals(False)
+            self.device_combo.show()
+            
+            # Set current device_serial from combobox
+            self.device_serial = self.device_combo.currentData()
+            
+            self.log(f"[OK] {len(authorized)} dispositivi connessi. Seleziona uno dal menu.")
+        else:
+            # Single device: hide combobox, use directly
+            device = authorized[0]
+            self.device_serial = device.serial
+            self.device_combo.hide()
+            self.device_label.setText(f"[OK] {device.model}")
+            self.log(f"[OK] Dispositivo connesso: {device.model} ({device.serial})")
+        
+        # Available storage (detected by the worker for the first device,
+        # which is also the one selected in the combobox)
+        self.log("Rilevamento storage disponibili...")
+        self.available_storage = storage
+        
+        if self.available_storage:
+            storage_list = ", ".join(self.available_storage.values())
+            self.log(f"[OK] Storage trovati: {storage_list}")
+            self.storage_btn.setEnabled(True)
+            self.log("Clicca 'Seleziona Storage' per scegliere cosa scansionare")
+        else:
+            self.log("ERRORE: Nessuno storage rilevato sul dispositivo")
     
     def _on_device_selection_changed(self, index: int):
         """Handle device selection change from combobox."""
@@ -547,29 +671,62 @@ class MainWindow(QMainWindow):
                 self.update_scan_button_state()
             
             # Re-detect storage for the new device
-            try:
-                self.log("Rilevamento storage...")
-                self.available_storage = get_storage_roots(self.device_serial)
-                if self.available_storage:
-                    storage_list = ", ".join(self.available_storage.values())
-                    self.log(f"Storage trovati: {storage_list}")
-                    self.storage_btn.setEnabled(True)
-                else:
-                    self.log("Nessuno storage rilevato")
-                    self.storage_btn.setEnabled(False)
-            except ADBError as e:
-                self.log(f"Errore nel rilevare storage: {e}")
-                self.storage_btn.setEnabled(False)
+            self.log("Rilevamento storage...")
+            self.storage_btn.setEnabled(False)
+            self.check_storage()
+    
+    def check_storage(self):
+        """Start detecting the selected device's storage in background."""
+        if self.storage_check_worker:
+            return  # on_storage_check_finished re-checks if the device changed
+        
+        # The device is probed over adb: don't block the GUI thread
+        self.storage_check_worker = StorageCheckWorker(self.device_serial)
+        self.storage_check_worker.signals.finished.connect(self.on_storage_check_finished)
+        QThreadPool.globalInstance().start(self.storage_check_worker)
+    
+    def on_storage_check_finished(self, device_serial: str, storage: dict, error: str):
+        """
+        Show the storage found for a device picked in the combobox.
+        
+        Args:
+            device_serial: Device the storage was detected for.
+            storage: Its storage roots.
+            error: ADB error message, or empty if none occurred.
+        """
+        self.storage_check_worker = None
+        
+        # A refresh started meanwhile: its device check reports the storage
+        if self.device_check_worker or not self.device_serial:
+            return
+        
+        # Another device was picked while this one was being checked
+        if device_serial != self.device_serial:
+            self.check_storage()
+            return
+        
+        if error:
+            self.log(f"Errore nel rilevare storage: {error}")
+            self.available_storage = {}
+            self.storage_btn.setEnabled(False)
+            return
+        
+        self.available_storage = storage
+        if self.available_storage:
+            storage_list = ", ".join(self.available_storage.values())
+            self.log(f"Storage trovati: {storage_list}")
+            self.storage_btn.setEnabled(True)
+        else:
+            self.log("Nessuno storage rilevato")
+            self.storage_btn.setEnabled(False)
     
     def start_scan_animation(self):
         """Start the scanning animation in the tree."""
         self.is_scanning = True
         self.scan_animation_dots = 0
         
-        # Add scanning placeholder item
-        self.scanning_item = QTreeWidgetItem(["Scansione", "", "", "", "", ""])
-        self.scanning_item.setFlags(self.scanning_item.flags() & ~Qt.ItemFlag.ItemIsUserCheckable)
-        self.folder_tree.addTopLevelItem(self.scanning_item)
+        # Show scanning placeholder row
+        self.folder_model.set_placeholder(_SCAN_FRAMES[0])
         
         # Start animation timer
         self.scan_animation_timer = QTimer()
@@ -581,9 +738,9 @@ class MainWindow(QMainWindow):
         if not self.is_scanning:
             return
         
-        self.scan_animation_dots = (self.scan_animation_dots + 1) % 4
-        dots = "." * self.scan_animation_dots
-        self.scanning_item.setText(0, f"Scansione{dots}")
+        self.flush_scan_messages()
+        self.scan_animation_dots = (self.scan_animation_dots + 1) % len(_SCAN_FRAMES)
+        self.folder_model.set_placeholder(_SCAN_FRAMES[self.scan_animation_dots])
     
     def stop_scan_animation(self):
         """Stop the scanning animation."""
@@ -591,6 +748,16 @@ class MainWindow(QMainWindow):
         if self.scan_animation_timer:
             self.scan_animation_timer.stop()
             self.scan_animation_timer = None
+        self.folder_model.set_placeholder("")
+        self.flush_scan_messages()
+    
+    def flush_scan_messages(self):
+        """Log the folders queued by the scan worker since the last tick."""
+        if not self.scan_worker:
+            return
+        paths = self.scan_worker.scanned_paths
+        while paths:
+            self.log(f"   Scansione: {paths.popleft()}")
     
     def scan_device(self):
         """Start device scan in background."""
@@ -606,7 +773,7 @@ class MainWindow(QMainWindow):
         cat_names = ", ".join([FILE_CATEGORIES[c]['name'] for c in self.selected_categories])
         self.log(f"Scansione {storage_names} for {cat_names}...")
         
-        self.folder_tree.clear()
+        self.clear_folder_tree()
         self.backup_btn.setEnabled(False)
         self.select_all_checkbox.setEnabled(False)
         self.scan_btn.setEnabled(False)
@@ -621,19 +788,29 @@ class MainWindow(QMainWindow):
             self.include_hidden,
             self.device_serial
         )
-        self.scan_worker.progress.connect(lambda msg: self.log(f"   {msg}"))
-        self.scan_worker.finished.connect(self.on_scan_finished)
-        self.scan_worker.error.connect(lambda e: self.log(f"ERRORE: {e}"))
-        self.scan_worker.start()
+        self.scan_worker.signals.finished.connect(self.on_scan_finished)
+        self.scan_worker.signals.error.connect(self.on_scan_error)
+        QThreadPool.globalInstance().start(self.scan_worker)
+    
+    def on_scan_error(self, error: str):
+        """Log a scan error after the progress that preceded it."""
+        self.flush_scan_messages()
+        self.log(f"ERRORE: {error}")
     
-    def on_scan_finished(self, result: Optional[ScanResult]):
-        """Handle scan completion."""
+    def on_scan_finished(self, result: Optional[ScanResult], rows: list[list[str]]):
+        """
+        Handle scan completion.
+        
+        Args:
+            result: Scan result, or None if the scan failed.
+            rows: Column texts for each of result.folders, in order.
+        """
         self.stop_scan_animation()
-        self.folder_tree.clear()
         self.scan_result = result
         self._scan_is_stale = False  # Reset stale flag after scan completes
         
         if not result or not result.folders:
+            self.clear_folder_tree()
             self.log("Nessun media trovato sul dispositivo.")
             # Re-enable controls even on empty result
             self.scan_btn.setEnabled(True)
@@ -643,30 +820,8 @@ class MainWindow(QMainWindow):
         
         self.log(f"[OK] Scansione completata: {result.total_media:,} file trovati")
         
-        # Block signals while populating
-        self.folder_tree.blockSignals(True)
-        
-        # Populate tree
-        for folder in result.folders:
-            item = NumericTreeWidgetItem([
-                folder.name,
-                folder.storage_type,
-                str(folder.file_count),
-                folder.size_human()
-            ])
-            item.setCheckState(0, Qt.CheckState.Checked)
-            item.setData(0, Qt.ItemDataRole.UserRole, folder)
-            # Store numeric values for proper sorting
-            item.setData(2, Qt.ItemDataRole.UserRole, folder.file_count)
-            item.setData(3, Qt.ItemDataRole.UserRole, folder.total_size)
-            self.folder_tree.addTopLevelItem(item)
-        
-        self.folder_tree.blockSignals(False)
-        
-        # Update summary
-        self.summary_label.setText(
-            f"Totale: {result.total_media:,} file ({result.size_human()})"
-        )
+        # One model reset: the view re-sorts and re-lays out once
+        self.folder_model.set_folders(result.folders, rows)
         
         # Update statistics display
         self.update_stats_display(result)
@@ -678,65 +833,61 @@ class MainWindow(QMainWindow):
         self.storage_btn.setEnabled(True)
         self.update_backup_button()
     
+    def clear_folder_tree(self):
+        """Remove every folder from the folder tree."""
+        self.folder_model.clear()
+    
     def on_select_all_changed(self, state: int):
         """Handle select all checkbox change."""
-        self.folder_tree.blockSignals(True)
-        
-        new_state = Qt.CheckState.Checked if state == Qt.CheckState.Checked.value else Qt.CheckState.Unchecked
-        for i in range(self.folder_tree.topLevelItemCount()):
-            item = self.folder_tree.topLevelItem(i)
-            item.setCheckState(0, new_state)
-        
-        self.folder_tree.blockSignals(False)
-        self.update_backup_button()
+        self.folder_model.set_all_checked(state == Qt.CheckState.Checked.value)
     
-    def on_item_changed(self, item: QTreeWidgetItem, column: int):
-        """Handle tree item change to update select all checkbox state."""
-        if column != 0:
-            return
-        
-        # Check if all items are checked, unchecked, or mixed
-        all_checked = True
-        all_unchecked = True
-        
-        for i in range(self.folder_tree.topLevelItemCount()):
-            item = self.folder_tree.topLevelItem(i)
-            if item.checkState(0) == Qt.CheckState.Checked:
-                all_unchecked = False
+    def on_checked_count_changed(self, checked_count: int):
+        """Update the select all checkbox and backup button after a check change."""
+        total = self.folder_model.folder_count
+        if total:
+            all_checked = checked_count == total
+            all_unchecked = checked_count == 0
+            
+            # Update checkbox without triggering its signal
+            self.select_all_checkbox.blockSignals(True)
+            if all_checked:
+                self.select_all_checkbox.setChecked(True)
+            elif all_unchecked:
+                self.select_all_checkbox.setChecked(False)
             else:
-                all_checked = False
-        
-        # Update checkbox without triggering its signal
-        self.select_all_checkbox.blockSignals(True)
-        if all_checked:
-            self.select_all_checkbox.setChecked(True)
-        elif all_unchecked:
-            self.select_all_checkbox.setChecked(False)
-        else:
-            self.select_all_checkbox.setTristate(True)
-            self.select_all_checkbox.setCheckState(Qt.CheckState.PartiallyChecked)
-        self.select_all_checkbox.blockSignals(False)
-        
-        # Reset tristate after setting
-        if all_checked or all_unchecked:
-            self.select_all_checkbox.setTristate(False)
+                self.select_all_checkbox.setTristate(True)
+                self.select_all_checkbox.setCheckState(Qt.CheckState.PartiallyChecked)
+            self.select_all_checkbox.blockSignals(False)
+            
+            # Reset tristate after setting
+            if all_checked or all_unchecked:
+                self.select_all_checkbox.setTristate(False)
         
+        self.update_selection_summary()
         self.update_backup_button()
     
+    def update_selection_summary(self):
+        """Show the totals of the checked folders (kept by the model, O(1))."""
+        model = self.folder_model
+        if not model.folder_count:
+            self.summary_label.setText("")
+        elif model.checked_count == model.folder_count:
+            self.summary_label.setText(
+                f"Totale: {model.total_file_count:,} file ({format_size(model.total_size)})"
+            )
+        else:
+            self.summary_label.setText(
+                f"Selezionati: {model.checked_file_count:,} di {model.total_file_count:,} file "
+                f"({format_size(model.checked_size)} di {format_size(model.total_size)})"
+            )
+    
     def get_selected_folders(self) -> list[MediaFolder]:
         """Get list of selected folders."""
-        folders = []
-        for i in range(self.folder_tree.topLevelItemCount()):
-            item = self.folder_tree.topLevelItem(i)
-            if item.checkState(0) == Qt.CheckState.Checked:
-                folder = item.data(0, Qt.ItemDataRole.UserRole)
-                if folder:
-                    folders.append(folder)
-        return folders
+        return self.folder_model.checked_folders()
     
     def update_backup_button(self):
         """Update backup button enabled state."""
-        has_selection = len(self.get_selected_folders()) > 0
+        has_selection = self.folder_model.checked_count > 0
         has_destination = self.destination is not None
         self.backup_btn.setEnabled(has_selection and has_destination)
     
@@ -745,16 +896,28 @@ class MainWindow(QMainWindow):
         folder = QFileDialog.getExistingDirectory(
             self,
             "Seleziona Cartella di Destinazione",
-            os.path.expanduser("~"),
-            QFileDialog.Option.ShowDirsOnly
+            self.destination or os.path.expanduser("~"),
+            # Native dialog; no symlink resolution while browsing slow mounts
+            QFileDialog.Option.ShowDirsOnly | QFileDialog.Option.DontResolveSymlinks
         )
         
         if folder:
-            self.destination = folder
-            self.dest_label.setText(folder)
-            self.dest_label.setStyleSheet("color: #4CAF50;")
+            self.set_destination(folder)
+            self.settings.setValue("last_destination", folder)
             self.log(f"Destinazione selezionata: {folder}")
-            self.update_backup_button()
+    
+    def set_destination(self, folder: str):
+        """Use folder as the backup destination."""
+        self.destination = folder
+        self.dest_label.setText(folder)
+        self.dest_label.setStyleSheet("color: #4CAF50;")
+        self.update_backup_button()
+    
+    def restore_destination(self):
+        """Reuse the destination of the previous session, if still there."""
+        folder = self.settings.value("last_destination", None)
+        if folder and os.path.isdir(folder):
+            self.set_destination(folder)
     
     def start_backup(self):
         """Start backup process."""
@@ -774,10 +937,26 @@ class MainWindow(QMainWindow):
         
         # Analyze in background
         self.log("\nAnalisi file in corso...")
-        self.analyze_worker = AnalyzeWorker(folders, self.selected_categories, self.destination, self.include_hidden, self.device_serial)
-        self.analyze_worker.finished.connect(self.on_analyze_finished)
-        self.analyze_worker.error.connect(self.on_analyze_error)
-        self.analyze_worker.start()
+        self.analyze_worker = AnalyzeWorker(folders, self.selected_categories, self.destination, self.include_hidden, device_serial=self.device_serial)
+        self.analyze_worker.signals.progress.connect(self.on_analyze_progress)
+        self.analyze_worker.signals.finished.connect(self.on_analyze_finished)
+        self.analyze_worker.signals.error.connect(self.on_analyze_error)
+        QThreadPool.globalInstance().start(self.analyze_worker)
+    
+    def on_analyze_progress(self, folders_done: int, files_to_sync: int, to_sync_bytes: int):
+        """
+        Show how far the analysis got (emitted once per folder).
+        
+        Args:
+            folders_done: Folders analyzed so far.
+            files_to_sync: Files found missing locally so far.
+            to_sync_bytes: Total size of those files.
+        """
+        total = len(self.analyze_worker.folders) if self.analyze_worker else folders_done
+        self.backup_btn.setText(f"Analisi {folders_done}/{total}...")
+        self.backup_btn.setToolTip(
+            f"Da scaricare finora: {files_to_sync:,} file ({format_size(to_sync_bytes)})"
+        )
     
     def on_analyze_error(self, error: str):
         """Handle analyze worker error."""
@@ -785,16 +964,15 @@ class MainWindow(QMainWindow):
         # Re-enable backup button
         self.backup_btn.setEnabled(True)
         self.backup_btn.setText("Avvia Backup")
+        self.backup_btn.setToolTip("")
         QMessageBox.critical(self, "Errore", f"Errore durante l'analisi:\n{error}")
     
-    def on_analyze_finished(self, to_sync: list, already_synced: list):
+    def on_analyze_finished(self, to_sync: list, already_synced: list, new_size: int, sync_size: int):
         """Handle analyze completion and show confirmation dialog."""
         # Re-enable backup button
         self.backup_btn.setEnabled(True)
         self.backup_btn.setText("Avvia Backup")
-        
-        sync_size = sum(f.size for f in already_synced)
-        new_size = sum(f.size for f in to_sync)
+        self.backup_btn.setToolTip("")
         
         self.log(f"   [OK] Gia sincronizzati: {len(already_synced):,} file ({format_size(sync_size)})")
         self.log(f"   [>>] Da scaricare: {len(to_sync):,} file ({format_size(new_size)})")
@@ -829,44 +1007,74 @@ class MainWindow(QMainWindow):
         self.select_all_checkbox.setEnabled(False)
         
         # Start worker
-        folders = self.get_selected_folders()
-        self._last_logged_file = None  # Reset for new backup
+        self._shown_progress = None  # Reset for new backup
         self.backup_worker = BackupWorker(
-            folders, 
-            self.selected_categories, 
-            self.destination,
-            self.include_hidden,
-            self.device_serial
+            self.analyze_worker.manager,
+            to_sync,
+            already_synced,
+            new_size,
+            sync_size
         )
-        self.backup_worker.progress.connect(self.on_backup_progress)
-        self.backup_worker.finished.connect(self.on_backup_finished)
-        self.backup_worker.start()
+        self.backup_worker.signals.file_failed.connect(self.on_backup_file_failed)
+        self.backup_worker.signals.finished.connect(self.on_backup_finished)
+        QThreadPool.globalInstance().start(self.backup_worker)
+        
+        # Poll progress at a fixed rate instead of repainting per file
+        self.backup_progress_timer = QTimer(self)
+        self.backup_progress_timer.timeout.connect(self.on_backup_progress)
+        self.backup_progress_timer.start(100)
     
-    def on_backup_progress(self, progress: BackupProgress):
-        """Handle backup progress update."""
+    def on_backup_progress(self):
+        """Show the backup worker's latest progress (polled by a timer)."""
+        worker = self.backup_worker
+        if not worker:
+            return
+        
+        # Log full local paths of the files started since the last poll
+        while worker.started_files:
+            self.log(f"   [>>] {worker.started_files.popleft()}")
+        
+        # The worker replaces the snapshot on every update, so an unchanged
+        # one means there is nothing new to paint since the last poll
+        progress = worker.latest
+        shown = self._shown_progress
+        if not progress or progress is shown:
+            return
+        self._shown_progress = progress
+        
         total_done = progress.completed_files + progress.skipped_files
         self.progress_bar.setValue(total_done)
         
-        if progress.current_file:
+        if progress.current_file and (not shown or progress.current_file != shown.current_file):
             # Show just filename in progress bar for UI readability
             filename = os.path.basename(progress.current_file)
             self.progress_bar.setFormat(f"%p% - {filename}")
-            
-            # Log full local path (avoid duplicate logging)
-            if progress.current_file != self._last_logged_file:
-                self.log(f"   [>>] {progress.current_file}")
-                self._last_logged_file = progress.current_file
-            
-        if progress.error_message:
-            # Log the specific error
-            self.log(f"[ERRORE] File: {progress.current_file}")
-            self.log(f"   -> {progress.error_message}")
-            self.log("   Continuo con il prossimo file...")
+    
+    def on_backup_file_failed(self, current_file: str, error_message: str):
+        """Log a file that failed to download."""
+        # Catch up first so the error follows the file's own log line
+        self.on_backup_progress()
+        self.log(f"[ERRORE] File: {current_file}")
+        self.log(f"   -> {error_message}")
+        self.log("   Continuo con il prossimo file...")
     
     def on_backup_finished(self, progress: BackupProgress, elapsed_time: float):
         """Handle backup completion."""
+        if self.backup_progress_timer:
+            self.backup_progress_timer.stop()
+            self.backup_progress_timer = None
+        # Flush whatever the last poll did not show yet
+        self.on_backup_progress()
         self.backup_worker = None
         
+        if self._close_after_backup:
+            # The window is already hidden, and closing a hidden window does
+            # not trigger quit-on-last-window-closed: quit explicitly
+            self.log("\n[!] Backup interrotto per la chiusura dell'applicazione.")
+            self.stop_log_writer()
+            QApplication.quit()
+            return
+        
         # Reset UI
         self.backup_btn.show()
         self.cancel_btn.hide()
@@ -929,9 +1137,15 @@ class MainWindow(QMainWindow):
             self.log("\nAnnullamento in corso...")
             self.backup_worker.cancel()
     
+    def showEvent(self, event):
+        """Render statistics that arrived while the window was hidden."""
+        super().showEvent(event)
+        self.refresh_stats_display()
+    
     def closeEvent(self, event):
         """Handle window close."""
-        if self.backup_worker and self.backup_worker.isRunning():
+        # Cleared by on_backup_finished, so set only while a backup runs
+        if self.backup_worker:
             reply = QMessageBox.question(
                 self,
                 "Backup in Corso",
@@ -942,18 +1156,28 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.StandardButton.No:
                 event.ignore()
                 return
-            
-            self.backup_worker.cancel()
-            self.backup_worker.wait(3000)  # Wait max 3 seconds
         
-        if self.log_file and not self.log_file.closed:
-            try:
-                self.log_file.write("=== Application Closed ===\n")
-                self.log_file.close()
-            except OSError:
-                pass
+        # The question runs a nested event loop: the backup may have
+        # finished (and cleared backup_worker) while it was open
+        if self.backup_worker:
+            # Stop cooperatively: hide now, quit once the worker has
+            # finished the current file (see on_backup_finished)
+            self.backup_worker.cancel()
+            self._close_after_backup = True
+            self.hide()
+            event.ignore()
+            return
         
+        self.stop_log_writer()
         event.accept()
+    
+    def stop_log_writer(self):
+        """Write the closing line and wait for the log file to be closed."""
+        if self.log_writer:
+            self.log_writer.write("=== Application Closed ===")
+            self.log_writer.stop()
+            self.log_writer.wait()
+            self.log_writer = None
 
 
 def run_gui():
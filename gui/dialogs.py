@@ -4,23 +4,32 @@ Dialog windows for storage and category selection.
 """
 
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QDialogButtonBox
+    QDialog, QVBoxLayout, QLabel, QListView, QDialogButtonBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QSignalBlocker
 
 from core.categories import FILE_CATEGORIES
 
+from .models import CheckableListModel
+
+
+# (id, name) of every category, in display order
+_CATEGORY_ROWS = tuple((cat_id, cat_info['name']) for cat_id, cat_info in FILE_CATEGORIES.items())
+
 
 class StorageSelectionDialog(QDialog):
     """Dialog for selecting which storage to scan."""
     
-    def __init__(self, available_storage: dict[str, str], parent=None):
+    def __init__(self, available_storage: dict[str, str], parent=None, selected_storage: dict[str, str] = None):
         """
         Args:
             available_storage: Dict mapping path -> display name
+            selected_storage: Previously selected storage to check again;
+                if empty, only the internal storage is checked
         """
         super().__init__(parent)
         self.available_storage = available_storage
+        self.previous_storage = selected_storage or {}
         self.selected_storage: dict[str, str] = {}
         
         self.setWindowTitle("Seleziona Storage")
@@ -35,19 +44,12 @@ class StorageSelectionDialog(QDialog):
         layout.addWidget(label)
         
         # List with checkboxes
-        self.list_widget = QListWidget()
-        for path, name in self.available_storage.items():
-            item = QListWidgetItem(name)
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            # Default: select internal, not SD cards
-            if name == "Interno":
-                item.setCheckState(Qt.CheckState.Checked)
-            else:
-                item.setCheckState(Qt.CheckState.Unchecked)
-            item.setData(Qt.ItemDataRole.UserRole, path)
-            self.list_widget.addItem(item)
-        
-        layout.addWidget(self.list_widget)
+        self.model = CheckableListModel(
+            list(self.available_storage.items()), self._initial_checks(), self
+        )
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        layout.addWidget(self.list_view)
         
         # Buttons
         button_box = QDialogButtonBox(
@@ -57,16 +59,26 @@ class StorageSelectionDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
     
+    def _initial_checks(self) -> list[bool]:
+        """Check state of each storage when the dialog opens."""
+        if self.previous_storage:
+            return [path in self.previous_storage for path in self.available_storage]
+        # Default: select internal, not SD cards
+        return [name == "Interno" for name in self.available_storage.values()]
+    
+    def reset(self, selected_storage: dict[str, str] = None):
+        """
+        Prepare the dialog to be shown again, without rebuilding it.
+        
+        Args:
+            selected_storage: Previously selected storage to check again.
+        """
+        self.previous_storage = selected_storage or {}
+        self.model.set_checked(self._initial_checks())
+    
     def get_selected_storage(self) -> dict[str, str]:
         """Return dict of selected storage paths and names."""
-        selected = {}
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                path = item.data(Qt.ItemDataRole.UserRole)
-                name = item.text()
-                selected[path] = name
-        return selected
+        return dict(self.model.checked_entries())
 
 
 class CategorySelectionDialog(QDialog):
@@ -75,6 +87,7 @@ class CategorySelectionDialog(QDialog):
     def __init__(self, parent=None, selected_categories: list[str] = None, include_hidden: bool = False):
         super().__init__(parent)
         self.selected_categories = selected_categories or ['media']
+        self._selected_set = set(self.selected_categories)  # O(1) membership per row
         self.include_hidden = include_hidden
         
         self.setWindowTitle("Seleziona Categorie")
@@ -91,26 +104,23 @@ class CategorySelectionDialog(QDialog):
         layout.addWidget(label)
         
         # List with checkboxes
-        self.list_widget = QListWidget()
-        for cat_id, cat_info in FILE_CATEGORIES.items():
-            item = QListWidgetItem(cat_info['name'])
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            if cat_id in self.selected_categories:
-                item.setCheckState(Qt.CheckState.Checked)
-            else:
-                item.setCheckState(Qt.CheckState.Unchecked)
-            item.setData(Qt.ItemDataRole.UserRole, cat_id)
-            self.list_widget.addItem(item)
-        
-        # Connect item changed to update hidden checkbox state
-        self.list_widget.itemChanged.connect(self._update_hidden_checkbox_state)
-        
-        layout.addWidget(self.list_widget)
+        self.model = CheckableListModel(
+            _CATEGORY_ROWS,
+            [cat_id in self._selected_set for cat_id, _ in _CATEGORY_ROWS],
+            self
+        )
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        
+        # Connect check changes to update hidden checkbox state
+        self.model.checked_count_changed.connect(self._update_hidden_checkbox_state)
+        
+        layout.addWidget(self.list_view)
         
         # Hidden files checkbox
         self.hidden_checkbox = QCheckBox("Includi file nascosti (file/cartelle che iniziano con '.')")
         self.hidden_checkbox.setChecked(self.include_hidden)
-        self.hidden_checkbox.setEnabled(len(self.selected_categories) > 0)
+        self.hidden_checkbox.setEnabled(self.model.checked_count > 0)
         layout.addWidget(self.hidden_checkbox)
         
         # Info label
@@ -128,26 +138,36 @@ class CategorySelectionDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
     
-    def _update_hidden_checkbox_state(self):
-        """Update hidden checkbox enabled state based on category selection."""
-        selected = self.get_selected_categories()
-        has_selection = len(selected) > 0
+    def _update_hidden_checkbox_state(self, checked_count: int):
+        """Update hidden checkbox enabled state from the number of checked categories."""
+        has_selection = checked_count > 0
         
         self.hidden_checkbox.setEnabled(has_selection)
         
-        # If no categories selected, uncheck hidden
+        # If no categories selected, uncheck hidden (a programmatic change:
+        # nothing should react to it)
         if not has_selection:
-            self.hidden_checkbox.setChecked(False)
+            with QSignalBlocker(self.hidden_checkbox):
+                self.hidden_checkbox.setChecked(False)
+    
+    def reset(self, selected_categories: list[str] = None, include_hidden: bool = False):
+        """
+        Prepare the dialog to be shown again, without rebuilding it.
+        
+        Args:
+            selected_categories: Categories to check.
+            include_hidden: Initial state of the hidden files checkbox.
+        """
+        self.selected_categories = selected_categories or ['media']
+        self._selected_set = set(self.selected_categories)
+        self.include_hidden = include_hidden
+        self.model.set_checked([cat_id in self._selected_set for cat_id, _ in _CATEGORY_ROWS])
+        with QSignalBlocker(self.hidden_checkbox):
+            self.hidden_checkbox.setChecked(include_hidden)
     
     def get_selected_categories(self) -> list[str]:
         """Return list of selected category IDs."""
-        selected = []
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                cat_id = item.data(Qt.ItemDataRole.UserRole)
-                selected.append(cat_id)
-        return selected
+        return [cat_id for cat_id, _ in self.model.checked_entries()]
     
     def get_include_hidden(self) -> bool:
         """Return whether to include hidden files."""
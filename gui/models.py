@@ -0,0 +1,275 @@
+"""
+GUI Models Module
+Qt item models backing the GUI views.
+"""
+
+from typing import Any, Optional, Sequence
+
+from PySide6.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, QObject, Qt, Signal
+
+from core.models import MediaFolder
+
+
+class FolderTableModel(QAbstractTableModel):
+    """
+    Table of scanned folders, one checkable row per folder.
+    
+    Rows are plain Python lists: the view only asks for the cells it
+    paints, so no per-row Qt item is ever allocated. While the table is
+    empty a placeholder text (e.g. the scan animation) can be shown as a
+    single non-checkable row.
+    """
+    
+    HEADERS = ("Cartella", "Storage", "File", "Dimensione")
+    
+    # Role returning sortable values: numbers for File and Dimensione
+    SORT_ROLE = Qt.ItemDataRole.UserRole
+    
+    checked_count_changed = Signal(int)  # Number of checked folders
+    
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._folders: list[MediaFolder] = []
+        self._rows: list[list[str]] = []  # Display texts per folder
+        self._checked: list[bool] = []
+        self._checked_count = 0
+        self._checked_files = 0  # Rolling totals of the checked folders
+        self._checked_size = 0
+        self._total_files = 0
+        self._total_size = 0
+        self._placeholder = ""
+    
+    @property
+    def checked_count(self) -> int:
+        """Number of checked folders."""
+        return self._checked_count
+    
+    @property
+    def folder_count(self) -> int:
+        """Number of folders in the table."""
+        return len(self._folders)
+    
+    @property
+    def checked_file_count(self) -> int:
+        """Number of files in the checked folders."""
+        return self._checked_files
+    
+    @property
+    def checked_size(self) -> int:
+        """Total size in bytes of the checked folders."""
+        return self._checked_size
+    
+    @property
+    def total_file_count(self) -> int:
+        """Number of files in all folders."""
+        return self._total_files
+    
+    @property
+    def total_size(self) -> int:
+        """Total size in bytes of all folders."""
+        return self._total_size
+    
+    def set_folders(self, folders: list[MediaFolder], rows: list[list[str]]):
+        """
+        Replace the table's contents; every folder starts out checked.
+        
+        Args:
+            folders: Folders to list.
+            rows: Column texts for each folder, in the same order.
+        """
+        self.beginResetModel()
+        self._folders = list(folders)
+        self._rows = rows
+        self._checked = [True] * len(self._folders)
+        self._checked_count = len(self._folders)
+        self._total_files = self._checked_files = sum(f.file_count for f in self._folders)
+        self._total_size = self._checked_size = sum(f.total_size for f in self._folders)
+        self.endResetModel()
+        self.checked_count_changed.emit(self._checked_count)
+    
+    def clear(self):
+        """Remove every folder from the table."""
+        self.set_folders([], [])
+    
+    def set_placeholder(self, text: str):
+        """Show text as the only row while the table is empty ("" hides it)."""
+        had_row = bool(self._placeholder)
+        self._placeholder = text
+        if self._folders:
+            return
+        if had_row and text:
+            index = self.index(0, 0)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+        elif had_row != bool(text):
+            self.beginResetModel()
+            self.endResetModel()
+    
+    def set_all_checked(self, checked: bool):
+        """Check or uncheck every folder at once."""
+        if not self._folders:
+            return
+        self._checked = [checked] * len(self._folders)
+        self._checked_count = len(self._folders) if checked else 0
+        self._checked_files = self._total_files if checked else 0
+        self._checked_size = self._total_size if checked else 0
+        self.dataChanged.emit(
+            self.index(0, 0),
+            self.index(len(self._folders) - 1, 0),
+            [Qt.ItemDataRole.CheckStateRole]
+        )
+        self.checked_count_changed.emit(self._checked_count)
+    
+    def checked_folders(self) -> list[MediaFolder]:
+        """Return the checked folders, in scan order."""
+        return [folder for folder, checked in zip(self._folders, self._checked) if checked]
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if self._folders:
+            return len(self._folders)
+        return 1 if self._placeholder else 0
+    
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        
+        if not self._folders:
+            # Placeholder row
+            if role == Qt.ItemDataRole.DisplayRole and column == 0:
+                return self._placeholder
+            return None
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[row][column]
+        if role == Qt.ItemDataRole.CheckStateRole and column == 0:
+            return Qt.CheckState.Checked if self._checked[row] else Qt.CheckState.Unchecked
+        if role == self.SORT_ROLE:
+            if column == 2:
+                return self._folders[row].file_count
+            if column == 3:
+                return self._folders[row].total_size
+            return self._rows[row][column]
+        return None
+    
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not (index.isValid() and self._folders and index.column() == 0
+                and role == Qt.ItemDataRole.CheckStateRole):
+            return False
+        
+        # The view may pass the state as an enum or as its int value
+        checked = value in (Qt.CheckState.Checked, Qt.CheckState.Checked.value)
+        row = index.row()
+        if self._checked[row] == checked:
+            return True
+        self._checked[row] = checked
+        sign = 1 if checked else -1
+        self._checked_count += sign
+        self._checked_files += sign * self._folders[row].file_count
+        self._checked_size += sign * self._folders[row].total_size
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        self.checked_count_changed.emit(self._checked_count)
+        return True
+    
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if not self._folders:
+            return Qt.ItemFlag.ItemIsEnabled
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+
+class CheckableListModel(QAbstractListModel):
+    """
+    List of checkable (id, label) entries, as used by the selection dialogs.
+    
+    Entries live in plain Python lists; the id of a row is exposed through
+    UserRole.
+    """
+    
+    # Every entry has the same flags: build them once, not per call
+    ITEM_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+    
+    checked_count_changed = Signal(int)  # Number of checked entries
+    
+    def __init__(self, entries: Sequence[tuple[str, str]], checked: Sequence[bool], parent: Optional[QObject] = None):
+        """
+        Args:
+            entries: (id, label) pairs, in display order.
+            checked: Initial check state of each entry.
+        """
+        super().__init__(parent)
+        self._ids = [entry_id for entry_id, _ in entries]
+        self._labels = [label for _, label in entries]
+        self._checked = list(checked)
+        self._checked_count = sum(self._checked)
+    
+    @property
+    def checked_count(self) -> int:
+        """Number of checked entries."""
+        return self._checked_count
+    
+    def set_checked(self, checked: Sequence[bool]):
+        """Replace every entry's check state at once."""
+        self._checked = list(checked)
+        self._checked_count = sum(self._checked)
+        if self._checked:
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self._checked) - 1),
+                [Qt.ItemDataRole.CheckStateRole]
+            )
+        self.checked_count_changed.emit(self._checked_count)
+    
+    def checked_entries(self) -> list[tuple[str, str]]:
+        """Return the (id, label) pairs of the checked entries."""
+        return [
+            (entry_id, label)
+            for entry_id, label, checked in zip(self._ids, self._labels, self._checked)
+            if checked
+        ]
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._ids)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._labels[row]
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if self._checked[row] else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.UserRole:
+            return self._ids[row]
+        return None
+    
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        
+        # The view may pass the state as an enum or as its int value
+        checked = value in (Qt.CheckState.Checked, Qt.CheckState.Checked.value)
+        row = index.row()
+        if self._checked[row] != checked:
+            self._checked[row] = checked
+            self._checked_count += 1 if checked else -1
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+            self.checked_count_changed.emit(self._checked_count)
+        return True
+    
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return self.ITEM_FLAGS
@@ -1,23 +1,110 @@
 """
 GUI Worker Threads Module
 Background workers for scan, backup, and analyze operations.
+
+Workers are QRunnables run on the global QThreadPool, so its threads are
+reused across scans and backups instead of creating one per operation.
+A QRunnable cannot emit signals itself: each worker exposes them through
+a small QObject in its `signals` attribute. The log writer is the one
+long-lived thread and is a QThread of its own.
 """
 
+import queue
 import time
+from collections import deque
+from dataclasses import replace
 from typing import Optional
 
-from PySide6.QtCore import QThread, Signal
+from PySide6.QtCore import QObject, QRunnable, QThread, Signal
+
+from core.adb import check_adb_available, get_connected_devices, ADBError
+from core.scanner import scan_media_folders, get_storage_roots, MediaFolder, ScanResult
+from core.backup import BackupManager, BackupProgress, FileToSync
+
+
+# Log file buffer; it is flushed after this many lines or seconds
+_LOG_FILE_BUFFER_SIZE = 64 * 1024
+_LOG_FLUSH_LINES = 100
+_LOG_FLUSH_INTERVAL = 1.0
+
+
+class DeviceCheckSignals(QObject):
+    """Signals emitted by DeviceCheckWorker."""
+    finished = Signal(bool, list, object, str)  # adb_available, authorized devices, storage roots, error
+
 
-from core.adb import ADBError
-from core.scanner import scan_media_folders, MediaFolder, ScanResult
-from core.backup import BackupManager, BackupProgress
+class StorageCheckSignals(QObject):
+    """Signals emitted by StorageCheckWorker."""
+    finished = Signal(str, object, str)  # device serial, storage roots, error
 
 
-class ScanWorker(QThread):
-    """Worker thread for scanning device."""
-    finished = Signal(object)  # ScanResult or None
-    progress = Signal(str)  # Current folder being scanned
+class ScanSignals(QObject):
+    """Signals emitted by ScanWorker."""
+    finished = Signal(object, list)  # ScanResult or None, row texts per folder
     error = Signal(str)
+
+
+class BackupSignals(QObject):
+    """Signals emitted by BackupWorker."""
+    file_failed = Signal(str, str)  # current_file, error_message
+    finished = Signal(object, float)  # Final BackupProgress, elapsed_time
+
+
+class AnalyzeSignals(QObject):
+    """Signals emitted by AnalyzeWorker."""
+    progress = Signal(int, int, object)  # folders_done, files_to_sync, to_sync_bytes
+    finished = Signal(list, list, object, object)  # to_sync, already_synced, new_size, sync_size
+    error = Signal(str)
+
+
+class DeviceCheckWorker(QRunnable):
+    """Worker for finding adb, the connected devices and their storage."""
+    
+    def __init__(self):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = DeviceCheckSignals()
+    
+    def run(self):
+        if not check_adb_available():
+            self.signals.finished.emit(False, [], {}, "")
+            return
+        
+        try:
+            devices = get_connected_devices()
+            authorized = [d for d in devices if d.status == "device"]
+            # The first device is the one selected by default
+            storage = get_storage_roots(authorized[0].serial) if authorized else {}
+            self.signals.finished.emit(True, authorized, storage, "")
+        except ADBError as e:
+            self.signals.finished.emit(True, [], {}, str(e))
+
+
+class StorageCheckWorker(QRunnable):
+    """Worker for finding the storage of a device picked after the device check."""
+    
+    def __init__(self, device_serial: str):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = StorageCheckSignals()
+        self.device_serial = device_serial
+    
+    def run(self):
+        try:
+            storage = get_storage_roots(self.device_serial)
+            self.signals.finished.emit(self.device_serial, storage, "")
+        except ADBError as e:
+            self.signals.finished.emit(self.device_serial, {}, str(e))
+
+
+class ScanWorker(QRunnable):
+    """
+    Worker for scanning device.
+    
+    The folders being scanned are queued in `scanned_paths` rather than
+    signalled; the GUI drains and formats them from its scan animation
+    timer.
+    """
     
     def __init__(self, storage_paths: dict[str, str], categories: list[str], include_hidden: bool = False, device_serial: Optional[str] = None):
         """
@@ -28,15 +115,20 @@ class ScanWorker(QThread):
             device_serial: Optional device serial to use
         """
         super().__init__()
-        self.storage_paths = storage_paths
-        self.categories = categories
+        # The GUI keeps its reference after run() returns
+        self.setAutoDelete(False)
+        self.signals = ScanSignals()
+        # Snapshots: the GUI may change its selection while the scan runs
+        self.storage_paths = dict(storage_paths)
+        self.categories = tuple(categories)
         self.include_hidden = include_hidden
         self.device_serial = device_serial
+        self.scanned_paths: deque[str] = deque()
     
     def run(self):
         try:
             def on_progress(path: str, index: int, total: int):
-                self.progress.emit(f"Scansione: {path}")
+                self.scanned_paths.append(path)
             
             result = scan_media_folders(
                 storage_paths=self.storage_paths,
@@ -45,66 +137,158 @@ class ScanWorker(QThread):
                 device_serial=self.device_serial,
                 progress_callback=on_progress
             )
-            self.finished.emit(result)
+            # Format the tree's row texts here rather than on the GUI thread
+            rows = [
+                [folder.name, folder.storage_type, str(folder.file_count), folder.size_human()]
+                for folder in result.folders
+            ]
+            self.signals.finished.emit(result, rows)
         except ADBError as e:
-            self.error.emit(str(e))
-            self.finished.emit(None)
+            self.signals.error.emit(str(e))
+            self.signals.finished.emit(None, [])
 
 
-class BackupWorker(QThread):
-    """Worker thread for backup operation."""
-    progress = Signal(object)  # BackupProgress
-    finished = Signal(object, float)  # Final BackupProgress, elapsed_time
+class BackupWorker(QRunnable):
+    """
+    Worker for backup operation.
     
-    def __init__(self, folders: list[MediaFolder], categories: list[str], destination: str, include_hidden: bool = False, device_serial: Optional[str] = None):
+    Progress is not signalled per file: the worker publishes the latest
+    snapshot in `latest` and queues the files it starts in `started_files`,
+    and the GUI polls both on a timer. Only failures are signalled, so
+    none of them can be coalesced away.
+    """
+    
+    def __init__(self, manager: BackupManager, to_sync: list[FileToSync], already_synced: list[FileToSync], new_size: int, sync_size: int):
+        """
+        Args:
+            manager: BackupManager that produced the analysis
+            to_sync: Files to download
+            already_synced: Files already present at the destination
+            new_size: Total size of to_sync
+            sync_size: Total size of already_synced
+        """
         super().__init__()
-        self.folders = folders
-        self.categories = categories
-        self.destination = destination
-        self.include_hidden = include_hidden
-        self.device_serial = device_serial
-        self.manager: Optional[BackupManager] = None
+        self.setAutoDelete(False)
+        self.signals = BackupSignals()
+        self.manager = manager
+        self.to_sync = to_sync
+        self.already_synced = already_synced
+        self.new_size = new_size
+        self.sync_size = sync_size
         self.start_time: float = 0
+        self.latest: Optional[BackupProgress] = None
+        self.started_files: deque[str] = deque()
     
     def run(self):
         self.start_time = time.time()
-        self.manager = BackupManager(self.destination, self.device_serial)
+        last_file = ""
+        reported_failures = 0
         
         def on_progress(bp: BackupProgress):
-            self.progress.emit(bp)
+            nonlocal last_file, reported_failures
+            if bp.current_file and bp.current_file != last_file:
+                self.started_files.append(bp.current_file)
+                last_file = bp.current_file
+            if bp.error_message and bp.failed_files > reported_failures:
+                reported_failures = bp.failed_files
+                self.signals.file_failed.emit(bp.current_file, bp.error_message)
+            # Snapshot: the manager keeps mutating the same object
+            self.latest = replace(bp)
         
-        result = self.manager.start_backup(
-            self.folders, 
-            categories=self.categories,
-            include_hidden=self.include_hidden,
+        # Reuse the analysis the user confirmed instead of redoing it
+        result = self.manager.backup_files(
+            self.to_sync,
+            self.already_synced,
+            self.new_size,
+            self.sync_size,
             progress_callback=on_progress
         )
         elapsed = time.time() - self.start_time
-        self.finished.emit(result, elapsed)
+        self.signals.finished.emit(result, elapsed)
     
     def cancel(self):
-        if self.manager:
-            self.manager.cancel()
+        self.manager.cancel()
 
 
-class AnalyzeWorker(QThread):
-    """Worker thread for analyzing files before backup."""
-    finished = Signal(list, list)  # to_sync, already_synced
-    error = Signal(str)
+class AnalyzeWorker(QRunnable):
+    """Worker for analyzing files before backup."""
     
     def __init__(self, folders: list[MediaFolder], categories: list[str], destination: str, include_hidden: bool = False, include_system: bool = False, device_serial: Optional[str] = None):
         super().__init__()
-        self.folders = folders
-        self.categories = categories
+        self.setAutoDelete(False)
+        self.signals = AnalyzeSignals()
+        # Snapshots: the GUI may change its selection while the analysis runs
+        self.folders = tuple(folders)
+        self.categories = tuple(categories)
         self.destination = destination
         self.include_hidden = include_hidden
         self.include_system = include_system
         self.device_serial = device_serial
+        self.manager: Optional[BackupManager] = None
     
     def run(self):
         try:
-            manager = BackupManager(self.destination, self.device_serial)
-            to_sync, already_synced = manager.analyze_folders(self.folders, self.categories, self.include_hidden)
-            self.finished.emit(to_sync, already_synced)
+            self.manager = manager = BackupManager(self.destination, self.device_serial)
+            to_sync, already_synced, new_size, sync_size = manager.analyze_folders(
+                self.folders, self.categories, self.include_hidden,
+                progress_callback=self.signals.progress.emit
+            )
+            self.signals.finished.emit(to_sync, already_synced, new_size, sync_size)
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
+
+
+class LogWriterThread(QThread):
+    """
+    Thread appending log lines to a file, so disk stalls never block the GUI.
+    
+    Lines are handed over through a queue by write(); stop() queues the
+    sentinel that makes the thread flush, close the file and exit.
+    """
+    
+    def __init__(self, path: str, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.path = path
+        self.queue: queue.SimpleQueue[Optional[str]] = queue.SimpleQueue()
+    
+    def write(self, message: str):
+        """Queue a line for the log file (never blocks)."""
+        self.queue.put_nowait(message + '\n')
+    
+    def stop(self):
+        """Ask the thread to write the queued lines and exit."""
+        self.queue.put_nowait(None)
+    
+    def run(self):
+        try:
+            log_file = open(self.path, 'a', encoding='utf-8', buffering=_LOG_FILE_BUFFER_SIZE)
+        except OSError as e:
+            print(f"Failed to create log file: {e}")
+            # Keep draining the queue so it does not grow until stop()
+            while self.queue.get() is not None:
+                pass
+            return
+        
+        with log_file:
+            unflushed = 0
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    line = self.queue.get(timeout=_LOG_FLUSH_INTERVAL)
+                except queue.Empty:
+                    line = ""  # Idle: only check whether a flush is due
+                if line is None:
+                    break
+                
+                try:
+                    if line:
+                        log_file.write(line)
+                        unflushed += 1
+                    now = time.monotonic()
+                    if unflushed and (unflushed >= _LOG_FLUSH_LINES
+                                      or now - last_flush >= _LOG_FLUSH_INTERVAL):
+                        log_file.flush()
+                        unflushed = 0
+                        last_flush = now
+                except OSError:
+                    pass
@@ -5,6 +5,7 @@ LazyVim-inspired design with responsive panels and smooth animations.
 """
 
 import time
+from collections import deque
 from typing import Optional
 
 from textual import on, work
@@ -17,7 +18,7 @@ from textual.widgets import (
 from textual.worker import get_current_worker
 
 from core.adb import check_adb_available, get_connected_devices, ADBError
-from core.scanner import scan_media_folders, ScanResult, get_storage_roots
+from core.scanner import scan_media_folders, ScanResult, get_storage_roots, clear_storage_roots_cache
 from core.categories import FILE_CATEGORIES
 from core.models import MediaFolder
 from core.utils import format_size
@@ -29,6 +30,13 @@ from .folder_tree import FolderTree
 from .log_panel import LogPanel
 
 
+# Minimum time between backup progress updates pushed to the UI (seconds)
+_PROGRESS_PUSH_INTERVAL = 1 / 30
+
+# How often messages queued by worker threads are shown in the log (seconds)
+_LOG_FLUSH_INTERVAL = 1 / 30
+
+
 class AndroSyncTUI(App):
     """AndroSync TUI Application - LazyVim-inspired design."""
     
@@ -206,6 +214,8 @@ class AndroSyncTUI(App):
         self.destination: str = "./backup"
         self.backup_manager: Optional[BackupManager] = None
         self._backup_cancelled = False
+        # Filled by worker threads, drained on the UI thread by _flush_pending_log
+        self._pending_log: deque[str] = deque()
         
         # Setup logging
         self.log_file = None
@@ -278,15 +288,25 @@ class AndroSyncTUI(App):
     
     def on_mount(self) -> None:
         """Initialize on mount."""
+        # The layout never changes after mount: look the widgets up once
+        # instead of walking the DOM on every update
+        self._status_panel = self.query_one("#status-content", StatusPanel)
+        self._stats_panel = self.query_one("#stats-content", StatsPanel)
+        self._log_panel = self.query_one("#log-panel", LogPanel)
+        self._progress_section = self.query_one("#progress-section", Container)
+        self._progress_bar = self.query_one("#progress-bar", ProgressBar)
+        self._folder_tree = self.query_one("#folder-tree", FolderTree)
+        self._btn_backup = self.query_one("#btn-backup", Button)
+        self._dest_display = self.query_one("#destination-display", ClickableDestination)
+        
+        self.set_interval(_LOG_FLUSH_INTERVAL, self._flush_pending_log)
         self.check_device()
     
     @work(exclusive=True)
     async def check_device(self) -> None:
         """Check for connected device."""
-        status_panel = self.query_one("#status-content", StatusPanel)
-        
         if not check_adb_available():
-            status_panel.device_status = "[red]󰜺 ADB not found[/red]"
+            self._status_panel.device_status = "[red]󰜺 ADB not found[/red]"
             self.device_connected = False
             return
         
@@ -295,15 +315,15 @@ class AndroSyncTUI(App):
             authorized = [d for d in devices if d.status == "device"]
             
             if len(authorized) == 0:
-                status_panel.device_status = "[yellow]󰜺 No device connected[/yellow]"
+                self._status_panel.device_status = "[yellow]󰜺 No device connected[/yellow]"
                 self.device_connected = False
             elif len(authorized) > 1:
-                status_panel.device_status = "[yellow]󰀨 Multiple devices[/yellow]"
+                self._status_panel.device_status = "[yellow]󰀨 Multiple devices[/yellow]"
                 self.device_connected = False
             else:
                 device = authorized[0]
                 self.device_info = f"{device.model}"
-                status_panel.device_status = f"[green]󰄬 {self.device_info}[/green]"
+                self._status_panel.device_status = f"[green]󰄬 {self.device_info}[/green]"
                 self.device_connected = True
                 
                 # Get available storage
@@ -314,42 +334,39 @@ class AndroSyncTUI(App):
                     self._update_storage_display()
                     
         except ADBError as e:
-            status_panel.device_status = f"[red]󰜺 Error: {e}[/red]"
+            self._status_panel.device_status = f"[red]󰜺 Error: {e}[/red]"
             self.device_connected = False
     
     def _update_storage_display(self) -> None:
         """Update storage display in status panel."""
-        status_panel = self.query_one("#status-content", StatusPanel)
         if self.selected_storage:
             names = list(self.selected_storage.values())
-            status_panel.storage_info = f"[cyan]{', '.join(names)}[/cyan]"
+            self._status_panel.storage_info = f"[cyan]{', '.join(names)}[/cyan]"
         else:
-            status_panel.storage_info = "[dim]None selected[/dim]"
+            self._status_panel.storage_info = "[dim]None selected[/dim]"
     
     def _update_category_display(self) -> None:
         """Update category display in status panel."""
-        status_panel = self.query_one("#status-content", StatusPanel)
         if self.selected_categories:
             names = [cat.capitalize() for cat in self.selected_categories]
-            status_panel.category_info = f"[magenta]{', '.join(names)}[/magenta]"
+            self._status_panel.category_info = f"[magenta]{', '.join(names)}[/magenta]"
         else:
-            status_panel.category_info = "[dim]None[/dim]"
+            self._status_panel.category_info = "[dim]None[/dim]"
     
     def _update_stats_display(self) -> None:
         """Update stats panel - adapts to selected categories."""
-        stats_panel = self.query_one("#stats-content", StatsPanel)
         if self.scan_result:
-            stats_panel.files_count = self.scan_result.total_files
-            stats_panel.total_size = self.scan_result.size_human()
+            self._stats_panel.files_count = self.scan_result.total_files
+            self._stats_panel.total_size = self.scan_result.size_human()
             # Show category-aware label
             if self.selected_categories:
-                stats_panel.categories_label = ", ".join(cat.capitalize() for cat in self.selected_categories)
+                self._stats_panel.categories_label = ", ".join(cat.capitalize() for cat in self.selected_categories)
             else:
-                stats_panel.categories_label = "files"
+                self._stats_panel.categories_label = "files"
         else:
-            stats_panel.files_count = 0
-            stats_panel.total_size = "0 B"
-            stats_panel.categories_label = "files"
+            self._stats_panel.files_count = 0
+            self._stats_panel.total_size = "0 B"
+            self._stats_panel.categories_label = "files"
     
     def action_select_storage(self) -> None:
         """Open storage selection modal."""
@@ -382,8 +399,7 @@ class AndroSyncTUI(App):
         def on_dismiss(destination: str) -> None:
             if destination:
                 self.destination = destination
-                dest_display = self.query_one("#destination-display", ClickableDestination)
-                dest_display.update(f"󰉋  [dim]Destination:[/dim] {destination}  [dim italic](click to change)[/dim italic]")
+                self._dest_display.update(f"󰉋  [dim]Destination:[/dim] {destination}  [dim italic](click to change)[/dim italic]")
         
         self.push_screen(DestinationModal(self.destination), on_dismiss)
     
@@ -401,6 +417,7 @@ class AndroSyncTUI(App):
     
     def action_refresh(self) -> None:
         """Refresh device connection."""
+        clear_storage_roots_cache()
         self.check_device()
         self.notify("Refreshing device connection...")
     
@@ -413,8 +430,9 @@ class AndroSyncTUI(App):
             result = scan_media_folders(
                 storage_paths=self.selected_storage,
                 categories=self.selected_categories,
-                progress_callback=lambda path, idx, total: self.call_from_thread(
-                    self._log_message, f"[dim]Scanning:[/dim] {path.split('/')[-1]}"
+                # Queued, not marshalled per folder: shown once per frame
+                progress_callback=lambda path, idx, total: self._pending_log.append(
+                    f"[dim]Scanning:[/dim] {path.split('/')[-1]}"
                 )
             )
             
@@ -428,56 +446,60 @@ class AndroSyncTUI(App):
     
     def _show_progress(self, message: str = "") -> None:
         """Show progress section."""
-        section = self.query_one("#progress-section", Container)
-        section.add_class("visible")
-        log_panel = self.query_one("#log-panel", LogPanel)
-        log_panel.clear()
+        self._flush_pending_log()
+        self._progress_section.add_class("visible")
+        self._log_panel.clear()
         if message:
-            log_panel.write(message)
+            self._log_panel.write(message)
     
     def _hide_progress(self) -> None:
         """Hide progress section."""
-        section = self.query_one("#progress-section", Container)
-        section.remove_class("visible")
+        self._flush_pending_log()
+        self._progress_section.remove_class("visible")
     
     def _log_message(self, message: str) -> None:
         """Log a message to the log panel."""
-        log_panel = self.query_one("#log-panel", LogPanel)
-        log_panel.write(message)
+        self._flush_pending_log()  # Keep queued messages in order
+        self._log_panel.write(message)
+    
+    def _flush_pending_log(self) -> None:
+        """Show the messages queued by worker threads with one re-render."""
+        pending = self._pending_log
+        if not pending:
+            return
+        messages = []
+        while pending:
+            messages.append(pending.popleft())
+        self._log_panel.write_many(messages)
     
     def _on_scan_complete(self, result: ScanResult) -> None:
         """Handle scan completion."""
         self._update_stats_display()
         
         # Populate tree
-        tree = self.query_one("#folder-tree", FolderTree)
-        tree.populate(result.folders)
+        self._folder_tree.populate(result.folders)
         
         # Enable backup button
-        btn_backup = self.query_one("#btn-backup", Button)
-        btn_backup.disabled = len(result.folders) == 0
+        self._btn_backup.disabled = len(result.folders) == 0
         
         self.notify(f"Found {len(result.folders)} folders with {result.total_files:,} files", timeout=3)
     
     def action_toggle_folder(self) -> None:
         """Toggle selection on current folder."""
-        tree = self.query_one("#folder-tree", FolderTree)
-        if tree.cursor_node:
-            tree.toggle_selection(tree.cursor_node)
+        if self._folder_tree.cursor_node:
+            self._folder_tree.toggle_selection(self._folder_tree.cursor_node)
     
     def action_toggle_all(self) -> None:
         """Toggle all folders (select all if not all selected, else deselect all)."""
-        tree = self.query_one("#folder-tree", FolderTree)
-        
-        if not tree.has_folders():
+        if not self._folder_tree.has_folders():
             self.notify("No folders to select", severity="warning")
             return
         
-        if tree.all_selected():
-            tree.deselect_all()
+        if self._folder_tree.all_selected():
+            self._folder_tree.deselect_all()
             self.notify("Deselected all folders")
         else:
-            tree.select_all()
+            self._folder_tree.select_all()
             self.notify("Selected all folders")
     
     def action_backup(self) -> None:
@@ -486,8 +508,7 @@ class AndroSyncTUI(App):
             self.notify("No device connected", severity="error")
             return
         
-        tree = self.query_one("#folder-tree", FolderTree)
-        selected = tree.get_selected_folders()
+        selected = self._folder_tree.get_selected_folders()
         
         if not selected:
             self.notify("Select at least one folder", severity="warning")
@@ -507,13 +528,10 @@ class AndroSyncTUI(App):
             self.backup_manager = BackupManager(self.destination)
             
             # Analyze
-            to_sync, already_synced = self.backup_manager.analyze_folders(
+            to_sync, already_synced, new_size, sync_size = self.backup_manager.analyze_folders(
                 folders, self.selected_categories
             )
             
-            sync_size = sum(f.size for f in already_synced)
-            new_size = sum(f.size for f in to_sync)
-            
             self.call_from_thread(
                 self._log_message,
                 f"[green]󰄬[/green] Already synced: {len(already_synced):,} files ({format_size(sync_size)})"
@@ -534,17 +552,40 @@ class AndroSyncTUI(App):
             # Setup progress bar
             self.call_from_thread(self._setup_backup_progress, len(to_sync))
             
-            # Start backup
+            # Start backup. Each call_from_thread waits for the UI, so
+            # per-file updates are collected and pushed in batches
+            done_files: list[str] = []
+            errors: list[tuple[str, str]] = []
+            last_completed = 0
+            reported_failures = 0
+            last_push = 0.0
+            
+            def push_progress(completed_files: int):
+                nonlocal last_push
+                last_push = time.monotonic()
+                self.call_from_thread(self._update_backup_progress, completed_files, done_files[:], errors[:])
+                done_files.clear()
+                errors.clear()
+            
             def on_progress(bp: BackupProgress):
+                nonlocal last_completed, reported_failures
                 if self._backup_cancelled:
                     return
-                self.call_from_thread(self._update_backup_progress, bp)
+                if bp.error_message and bp.failed_files > reported_failures:
+                    reported_failures = bp.failed_files
+                    errors.append((bp.current_file, bp.error_message))
+                if bp.completed_files > last_completed:
+                    last_completed = bp.completed_files
+                    done_files.append(bp.current_file)
+                if time.monotonic() - last_push >= _PROGRESS_PUSH_INTERVAL:
+                    push_progress(bp.completed_files)
             
-            result = self.backup_manager.start_backup(
-                folders,
-                categories=self.selected_categories,
+            result = self.backup_manager.backup_files(
+                to_sync, already_synced, new_size, sync_size,
                 progress_callback=on_progress
             )
+            if not self._backup_cancelled and (done_files or errors):
+                push_progress(result.completed_files)
             
             elapsed_time = time.time() - start_time
             self.call_from_thread(self._on_backup_complete, result, elapsed_time)
@@ -554,26 +595,27 @@ class AndroSyncTUI(App):
     
     def _setup_backup_progress(self, total: int) -> None:
         """Setup progress bar for backup."""
-        progress_bar = self.query_one("#progress-bar", ProgressBar)
-        progress_bar.update(total=total, progress=0)
+        self._progress_bar.update(total=total, progress=0)
     
-    def _update_backup_progress(self, bp: BackupProgress) -> None:
-        """Update backup progress."""
-        progress_bar = self.query_one("#progress-bar", ProgressBar)
-        progress_bar.update(progress=bp.completed_files)
+    def _update_backup_progress(self, completed_files: int, done_files: list[str], errors: list[tuple[str, str]]) -> None:
+        """
+        Update backup progress with a batch of per-file events.
         
-        if bp.error_message:
-            self._log_message(f"[red]ERROR:[/red] {bp.current_file} -> {bp.error_message}")
-
-        if bp.current_file:
-            # Show only filename in UI, but log full path to file
-            filename = bp.current_file.split('/')[-1] if '/' in bp.current_file else bp.current_file
-            # Log full path (only when file count increases)
-            if not hasattr(self, '_last_tui_completed'):
-                self._last_tui_completed = 0
-            if bp.completed_files > self._last_tui_completed:
-                self._log_message(f"[green]󰄬[/green] {bp.current_file}")
-                self._last_tui_completed = bp.completed_files
+        Args:
+            completed_files: Files downloaded so far.
+            done_files: Full paths of the files completed since the last update.
+            errors: (file, error message) pairs for failures since the last update.
+        """
+        self._progress_bar.update(progress=completed_files)
+        
+        # One re-render for the whole batch
+        messages = [
+            f"[red]ERROR:[/red] {current_file} -> {error_message}"
+            for current_file, error_message in errors
+        ]
+        messages.extend(f"[green]󰄬[/green] {current_file}" for current_file in done_files)
+        self._flush_pending_log()
+        self._log_panel.write_many(messages)
     
     def _on_backup_complete(self, result: BackupProgress, elapsed_time: float) -> None:
         """Handle backup completion."""
@@ -604,12 +646,10 @@ class AndroSyncTUI(App):
         elif result.status == BackupStatus.DISCONNECTED:
             # Update device status
             self.device_connected = False
-            status_panel = self.query_one("#status-content", StatusPanel)
-            status_panel.device_status = "[red]󰜺 Device disconnected[/red]"
+            self._status_panel.device_status = "[red]󰜺 Device disconnected[/red]"
             
             # Disable backup button
-            btn_backup = self.query_one("#btn-backup", Button)
-            btn_backup.disabled = True
+            self._btn_backup.disabled = True
             
             self.notify(f"Device disconnected after {time_str}", severity="error", timeout=8)
             self._log_message("")
@@ -628,9 +668,8 @@ class AndroSyncTUI(App):
     @on(Tree.NodeSelected)
     def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
         """Handle tree node selection - toggle checkbox."""
-        tree = self.query_one("#folder-tree", FolderTree)
         if event.node.data:
-            tree.toggle_selection(event.node)
+            self._folder_tree.toggle_selection(event.node)
 
     def on_unmount(self) -> None:
         """Handle unmount."""
@@ -29,9 +29,7 @@ class FolderTree(Tree):
         by_storage: dict[str, list[MediaFolder]] = {}
         for folder in folders:
             storage = folder.storage_type or "Storage"
-            if storage not in by_storage:
-                by_storage[storage] = []
-            by_storage[storage].append(folder)
+            by_storage.setdefault(storage, []).append(folder)
         
         for storage_name, storage_folders in by_storage.items():
             storage_node = self.root.add(f"[bold cyan]󰄫 {storage_name}[/bold cyan]", expand=True)
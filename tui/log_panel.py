@@ -20,7 +20,18 @@ class LogPanel(ScrollableContainer):
     
     def write(self, message: str) -> None:
         """Add a log message."""
-        self.messages.append(message)
+        self.write_many([message])
+    
+    def write_many(self, messages: list[str]) -> None:
+        """
+        Add several log messages with a single re-render.
+        
+        Args:
+            messages: Messages to append, in order.
+        """
+        if not messages:
+            return
+        self.messages.extend(messages)
         if len(self.messages) > 100:
             self.messages = self.messages[-100:]
         self._update_content()
@@ -28,7 +39,8 @@ class LogPanel(ScrollableContainer):
         
         # Write to app log file if available
         if hasattr(self.app, '_log_to_file'):
-            self.app._log_to_file(message)
+            for message in messages:
+                self.app._log_to_file(message)
     
     def clear(self) -> None:
         """Clear all messages."""